@@ -1,216 +1,387 @@
 #!/usr/bin/env python3
 import json
 import sys
+import errno
 import os
+import select
+import shutil
 import socket
+import ssl
 import subprocess
-from datetime import datetime
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 
-def send_tcp_notification(message, host='localhost', port=9999):
+# orjson is optional: faster and returns bytes directly; stdlib json otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+HOOKS_DIR = Path(__file__).parent
+PROGRESS_DIR = HOOKS_DIR.parent / "progress"
+NOTIFICATIONS_FILE = PROGRESS_DIR / "notifications.txt"
+SOUND_MARKER_FILE = PROGRESS_DIR / "PLAY_SOUND.txt"
+COMPLETIONS_LOG = PROGRESS_DIR / "agent_completions.log"
+COMPLETIONS_JSONL = PROGRESS_DIR / "completions.jsonl"
+DEBUG_LOG = PROGRESS_DIR / ".notification_debug.log"
+ERROR_LOG = PROGRESS_DIR / ".notification_errors.log"
+DNS_CACHE_FILE = PROGRESS_DIR / ".dns_cache.json"
+DNS_CACHE_TTL = 300  # seconds
+LOG_ROTATE_BYTES = 10_000_000  # logs past this size are moved to <name>.1
+TCP_CONNECT_TIMEOUT = 0.05  # seconds; the listener is on loopback or the LAN
+# Native notifications only make sense on a Mac the user is sitting at
+IS_MAC_LOCAL = sys.platform == "darwin" and os.environ.get('NOTIFICATION_MODE', 'local') == 'local'
+
+def json_dumps(obj):
+    """Serialize obj to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def json_loads(data):
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@dataclass(frozen=True)
+class NotificationContext:
+    """Everything the senders need, computed once per hook run."""
+    message: str
+    title: str
+    now_iso: str
+    now_human: str
+
+    @classmethod
+    def create(cls, message, title="Agent Complete"):
+        now_iso, now_human = format_timestamps(time.time())
+        return cls(message, title, now_iso, now_human)
+
+
+def format_timestamps(t):
+    """Format epoch time t as (ISO 8601 with microseconds, 'YYYY-MM-DD HH:MM:SS').
+
+    Uses time.strftime rather than building datetime objects.
+    """
+    now_human = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(t))
+    now_iso = f"{now_human[:10]}T{now_human[11:]}.{int(t % 1 * 1_000_000):06d}"
+    return now_iso, now_human
+
+
+_OPENER = None
+_OPENER_LOCK = threading.Lock()
+
+
+def _get_opener():
+    """Build one urllib opener with a shared TLS context for all webhooks.
+
+    urlopen() creates a fresh SSL context (and reloads the CA bundle) per
+    call; sharing one context across the concurrent webhook posts avoids
+    paying that setup for every channel.
+    """
+    global _OPENER
+    with _OPENER_LOCK:
+        if _OPENER is None:
+            context = ssl.create_default_context()
+            _OPENER = urllib.request.build_opener(
+                urllib.request.HTTPSHandler(context=context)
+            )
+    return _OPENER
+
+
+def _post(url, data, headers=None, timeout=5):
+    """POST raw bytes to url and return the HTTP status code."""
+    req = urllib.request.Request(url, data=data, headers=headers or {})
+    with _get_opener().open(req, timeout=timeout) as response:
+        return response.status
+
+def _is_ip_literal(host):
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, host)
+            return True
+        except (OSError, ValueError):
+            pass
+    return False
+
+
+def resolve_tcp_address(host, port):
+    """Resolve host:port to (family, sockaddr), caching hostnames on disk.
+
+    Each hook run is a new process, so the lookup is kept in
+    DNS_CACHE_FILE for DNS_CACHE_TTL seconds. IP literals skip the cache.
+    """
+    if _is_ip_literal(host):
+        family = socket.AF_INET6 if ':' in host else socket.AF_INET
+        return family, (host, port)
+
+    key = f"{host}:{port}"
+    now = time.time()
+    try:
+        cache = json_loads(DNS_CACHE_FILE.read_bytes())
+    except Exception:
+        cache = {}
+
+    entry = cache.get(key)
+    if entry and now - entry.get("resolved_at", 0) < DNS_CACHE_TTL:
+        return entry["family"], tuple(entry["sockaddr"])
+
+    family, _, _, _, sockaddr = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0]
+    cache[key] = {"family": int(family), "sockaddr": list(sockaddr), "resolved_at": now}
+    try:
+        PROGRESS_DIR.mkdir(parents=True, exist_ok=True)
+        DNS_CACHE_FILE.write_bytes(json_dumps(cache))
+    except Exception:
+        pass
+    return family, sockaddr
+
+def send_tcp_notification(ctx, host='localhost', port=9999):
     """Send notification via TCP socket to Windows listener"""
     try:
         # Try to get Windows IP from environment or use default
         windows_ip = os.environ.get('WINDOWS_NOTIFY_IP', host)
-        
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        family, sockaddr = resolve_tcp_address(windows_ip, port)
+
+        with socket.socket(family, socket.SOCK_STREAM) as s:
+            # Non-blocking connect with a short deadline, so an offline
+            # listener costs TCP_CONNECT_TIMEOUT rather than a 2s timeout.
+            # connect_ex reports failures as an errno instead of raising.
+            s.setblocking(False)
+            err = s.connect_ex(sockaddr)
+            if err in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+                _, writable, _ = select.select([], [s], [], TCP_CONNECT_TIMEOUT)
+                if not writable:
+                    return False
+                err = s.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if err != 0:
+                return False
+
             s.settimeout(2)
-            s.connect((windows_ip, port))
             notification_data = {
                 'type': 'agent_complete',
-                'message': message,
-                'timestamp': datetime.now().isoformat()
+                'message': ctx.message,
+                'timestamp': ctx.now_iso
             }
-            s.send(json.dumps(notification_data).encode() + b'\n')
+            # sendall: send() may transmit only part of the payload
+            s.sendall(json_dumps(notification_data) + b'\n')
             return True
     except Exception as e:
         # Log connection failure silently
         return False
 
-def write_notification_file(message):
+# Local file writes are queued during the run and flushed together at the
+# end of main(): one open + one write per file instead of one per log line.
+_PENDING_APPENDS = {}
+_PENDING_REPLACES = {}
+
+
+def queue_append(path, text):
+    """Queue text to be appended to path on the next flush."""
+    _PENDING_APPENDS.setdefault(path, []).append(text)
+
+
+def queue_replace(path, text):
+    """Queue path to be overwritten with text on the next flush."""
+    _PENDING_REPLACES[path] = text
+
+
+def write_chunks(path, chunks, flags=os.O_APPEND):
+    """Write text chunks to path with one gathered write(2).
+
+    os.writev hands every queued chunk to the kernel in a single call, on a
+    raw descriptor without the TextIOWrapper layer. With O_APPEND the batch
+    is not interleaved with writes from other hook processes.
+    """
+    data = [chunk.encode("utf-8") for chunk in chunks]
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | flags, 0o644)
+    try:
+        if hasattr(os, "writev"):
+            os.writev(fd, data)
+        else:
+            os.write(fd, b"".join(data))
+    finally:
+        os.close(fd)
+
+
+def rotate_if_large(path):
+    """Move path to <name>.1 (replacing any previous one) once it exceeds LOG_ROTATE_BYTES."""
+    try:
+        if path.stat().st_size > LOG_ROTATE_BYTES:
+            path.replace(path.with_name(path.name + ".1"))
+            return True
+    except OSError:
+        pass
+    return False
+
+
+def flush_pending_writes():
+    """Write all queued file output, one open and one write per file."""
+    if not (_PENDING_APPENDS or _PENDING_REPLACES):
+        return
+    try:
+        PROGRESS_DIR.mkdir(parents=True, exist_ok=True)
+    except Exception:
+        pass
+
+    for path, chunks in _PENDING_APPENDS.items():
+        rotate_if_large(path)
+        try:
+            write_chunks(path, chunks)
+        except Exception:
+            pass
+    for path, text in _PENDING_REPLACES.items():
+        try:
+            write_chunks(path, [text], os.O_TRUNC)
+        except Exception:
+            pass
+
+    _PENDING_APPENDS.clear()
+    _PENDING_REPLACES.clear()
+
+def write_notification_file(ctx):
     """Write to a shared file that Windows can monitor"""
     try:
-        notify_path = HOOKS_DIR.parent / "progress/notifications.txt"
-        notify_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(notify_path, "a") as f:
-            f.write(f"[{datetime.now().isoformat()}] {message}\n")
-        
+        queue_append(NOTIFICATIONS_FILE, f"[{ctx.now_iso}] {ctx.message}\n")
+
         # Also create a trigger file for sound
-        sound_marker = HOOKS_DIR.parent / "progress/PLAY_SOUND.txt"
-        sound_marker.write_text(datetime.now().isoformat())
+        queue_replace(SOUND_MARKER_FILE, ctx.now_iso)
         return True
     except Exception:
         return False
 
-def send_pushover_notification(message):
-    """Send notification via Pushover API (works everywhere)"""
-    try:
-        token = os.environ.get('PUSHOVER_APP_TOKEN', '')
-        user_key = os.environ.get('PUSHOVER_USER_KEY', '')
-
-        if token and user_key:
-            import urllib.request
-            import urllib.parse
-
-            data = urllib.parse.urlencode({
-                'token': token,
-                'user': user_key,
-                'message': message,
-                'title': 'Agent Complete',
-                'sound': 'pushover',
-                'priority': 0
-            }).encode()
-
-            req = urllib.request.Request('https://api.pushover.net/1/messages.json')
-            response = urllib.request.urlopen(req, data, timeout=5)
-            return response.status == 200
-    except:
-        pass
-    return False
+def _pushover_request(ctx, env):
+    """Pushover API (works everywhere).
+
+    Set PUSHOVER_APP_TOKEN and PUSHOVER_USER_KEY environment variables to enable.
+    """
+    body = urllib.parse.urlencode({
+        'token': env['PUSHOVER_APP_TOKEN'],
+        'user': env['PUSHOVER_USER_KEY'],
+        'message': ctx.message,
+        'title': ctx.title,
+        'sound': 'pushover',
+        'priority': 0
+    }).encode()
+    return 'https://api.pushover.net/1/messages.json', body, {}
 
 
-def send_slack_notification(message, title="Agent Complete"):
-    """Send notification via Slack webhook.
+def _slack_request(ctx, env):
+    """Slack incoming webhook.
 
     Set SLACK_WEBHOOK_URL environment variable to enable.
     Get webhook URL from: Slack App > Incoming Webhooks
     """
-    try:
-        webhook_url = os.environ.get('SLACK_WEBHOOK_URL', '')
-        if not webhook_url:
-            return False
-
-        import urllib.request
-
-        payload = {
-            "blocks": [
-                {
-                    "type": "header",
-                    "text": {
-                        "type": "plain_text",
-                        "text": f"🤖 {title}",
-                        "emoji": True
-                    }
-                },
-                {
-                    "type": "section",
-                    "text": {
+    payload = {
+        "blocks": [
+            {
+                "type": "header",
+                "text": {
+                    "type": "plain_text",
+                    "text": f"🤖 {ctx.title}",
+                    "emoji": True
+                }
+            },
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": ctx.message
+                }
+            },
+            {
+                "type": "context",
+                "elements": [
+                    {
                         "type": "mrkdwn",
-                        "text": message
+                        "text": f"📅 {ctx.now_human}"
                     }
-                },
-                {
-                    "type": "context",
-                    "elements": [
-                        {
-                            "type": "mrkdwn",
-                            "text": f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-                        }
-                    ]
-                }
-            ]
-        }
-
-        data = json.dumps(payload).encode('utf-8')
-        req = urllib.request.Request(
-            webhook_url,
-            data=data,
-            headers={"Content-Type": "application/json"}
-        )
-        response = urllib.request.urlopen(req, timeout=5)
-        return response.status == 200
-    except Exception:
-        pass
-    return False
+                ]
+            }
+        ]
+    }
+    return env['SLACK_WEBHOOK_URL'], json_dumps(payload), {"Content-Type": "application/json"}
 
 
-def send_discord_notification(message, title="Agent Complete"):
-    """Send notification via Discord webhook.
+def _discord_request(ctx, env):
+    """Discord webhook.
 
     Set DISCORD_WEBHOOK_URL environment variable to enable.
     Get webhook URL from: Server Settings > Integrations > Webhooks
     """
-    try:
-        webhook_url = os.environ.get('DISCORD_WEBHOOK_URL', '')
-        if not webhook_url:
-            return False
-
-        import urllib.request
-
-        payload = {
-            "embeds": [
-                {
-                    "title": f"🤖 {title}",
-                    "description": message,
-                    "color": 5814783,  # Blue color
-                    "timestamp": datetime.now().isoformat(),
-                    "footer": {
-                        "text": "Claude Code Agent"
-                    }
+    payload = {
+        "embeds": [
+            {
+                "title": f"🤖 {ctx.title}",
+                "description": ctx.message,
+                "color": 5814783,  # Blue color
+                "timestamp": ctx.now_iso,
+                "footer": {
+                    "text": "Claude Code Agent"
                 }
-            ]
-        }
-
-        data = json.dumps(payload).encode('utf-8')
-        req = urllib.request.Request(
-            webhook_url,
-            data=data,
-            headers={"Content-Type": "application/json"}
-        )
-        response = urllib.request.urlopen(req, timeout=5)
-        return response.status == 204  # Discord returns 204 on success
-    except Exception:
-        pass
-    return False
+            }
+        ]
+    }
+    return env['DISCORD_WEBHOOK_URL'], json_dumps(payload), {"Content-Type": "application/json"}
 
 
-def send_telegram_notification(message, title="Agent Complete"):
-    """Send notification via Telegram bot.
+def _telegram_request(ctx, env):
+    """Telegram bot.
 
     Set TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID environment variables to enable.
     Get bot token from @BotFather, chat ID from @userinfobot
     """
+    url = f"https://api.telegram.org/bot{env['TELEGRAM_BOT_TOKEN']}/sendMessage"
+    body = urllib.parse.urlencode({
+        'chat_id': env['TELEGRAM_CHAT_ID'],
+        'text': f"🤖 *{ctx.title}*\n\n{ctx.message}",
+        'parse_mode': 'Markdown'
+    }).encode()
+    return url, body, {}
+
+
+# Webhook channels: the env vars that enable them, a builder returning
+# (url, body, headers), and the HTTP status the service returns on success
+WEBHOOKS = [
+    {"name": "Pushover", "env": ("PUSHOVER_APP_TOKEN", "PUSHOVER_USER_KEY"),
+     "build": _pushover_request, "ok_status": 200},
+    {"name": "Slack", "env": ("SLACK_WEBHOOK_URL",),
+     "build": _slack_request, "ok_status": 200},
+    {"name": "Discord", "env": ("DISCORD_WEBHOOK_URL",),
+     "build": _discord_request, "ok_status": 204},
+    {"name": "Telegram", "env": ("TELEGRAM_BOT_TOKEN", "TELEGRAM_CHAT_ID"),
+     "build": _telegram_request, "ok_status": 200},
+]
+
+
+def post_webhook(entry, ctx):
+    """Send a notification through one WEBHOOKS entry. Returns True on success."""
     try:
-        bot_token = os.environ.get('TELEGRAM_BOT_TOKEN', '')
-        chat_id = os.environ.get('TELEGRAM_CHAT_ID', '')
-
-        if not bot_token or not chat_id:
+        env = os.environ
+        if not all(env.get(var) for var in entry["env"]):
             return False
-
-        import urllib.request
-        import urllib.parse
-
-        text = f"🤖 *{title}*\n\n{message}"
-
-        url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-        data = urllib.parse.urlencode({
-            'chat_id': chat_id,
-            'text': text,
-            'parse_mode': 'Markdown'
-        }).encode()
-
-        req = urllib.request.Request(url, data=data)
-        response = urllib.request.urlopen(req, timeout=5)
-        return response.status == 200
+        url, body, headers = entry["build"](ctx, env)
+        return _post(url, body, headers) == entry["ok_status"]
     except Exception:
-        pass
-    return False
+        return False
 
-def send_tmux_notification(message):
+def send_tmux_notification(ctx):
     """Send notification to tmux if running in tmux session"""
     try:
         if 'TMUX' in os.environ:
-            # Display message in tmux
+            # Display message and set status bar alert in one tmux call,
+            # chaining the two commands with tmux's ';' separator
             subprocess.run(
-                ['tmux', 'display-message', '-d', '2000', f"📢 {message}"],
-                capture_output=True,
-                timeout=2
-            )
-            
-            # Also set status bar alert
-            subprocess.run(
-                ['tmux', 'set-option', '-g', 'status-right', f'"Agent Complete: {message}"'],
+                ['tmux',
+                 'display-message', '-d', '2000', f"📢 {ctx.message}", ';',
+                 'set-option', '-g', 'status-right', f'"{ctx.title}: {ctx.message}"'],
                 capture_output=True,
                 timeout=2
             )
@@ -222,88 +393,165 @@ def send_tmux_notification(message):
 def play_terminal_bell():
     """Play terminal bell sound (works over SSH)"""
     try:
-        # Send bell character to stderr
+        # Send bell character to stderr (this is all `tput bel` would emit)
         sys.stderr.write('\a')
         sys.stderr.flush()
-        
-        # Also try tput if available
-        subprocess.run(['tput', 'bel'], capture_output=True, timeout=1)
         return True
     except:
         return False
 
-def log_completion(agent_name, session_id, task_info=None):
+def migrate_completions_json(jsonl_path):
+    """One-time conversion of the legacy completions.json array to JSON Lines."""
+    legacy_path = jsonl_path.with_suffix(".json")
+    if not legacy_path.exists():
+        return
+    # A huge legacy array is archived as-is rather than parsed into memory
+    if rotate_if_large(legacy_path):
+        return
+    try:
+        entries = json_loads(legacy_path.read_bytes())
+        lines = "".join(json_dumps(entry).decode('utf-8') + "\n" for entry in entries)
+        # Legacy entries are older, so they go before anything already appended
+        if jsonl_path.exists():
+            lines += jsonl_path.read_text()
+        jsonl_path.write_text(lines)
+        legacy_path.unlink()
+    except Exception:
+        pass
+
+def log_completion(ctx, agent_name, session_id, task_info=None):
     """Log the completion to progress files"""
     try:
-        log_path = HOOKS_DIR.parent / "progress/agent_completions.log"
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
+        timestamp = ctx.now_human
+
         # Write to main log
-        with open(log_path, "a") as f:
-            f.write(f"[{timestamp}] Agent: {agent_name} | Session: {session_id}\n")
-            if task_info:
-                f.write(f"  Task: {task_info.get('task_id', 'N/A')} | Status: COMPLETED\n")
-        
-        # Write to JSON log for structured data
-        json_log_path = HOOKS_DIR.parent / "progress/completions.json"
-        
+        queue_append(COMPLETIONS_LOG, f"[{timestamp}] Agent: {agent_name} | Session: {session_id}\n")
+        if task_info:
+            queue_append(COMPLETIONS_LOG, f"  Task: {task_info.get('task_id', 'N/A')} | Status: COMPLETED\n")
+
+        # Append to JSON Lines log for structured data (one entry per line,
+        # so each write is O(1) regardless of history size)
+        migrate_completions_json(COMPLETIONS_JSONL)
+
         completion_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": ctx.now_iso,
             "agent": agent_name,
             "session_id": session_id,
             "task_info": task_info
         }
-        
-        if json_log_path.exists():
-            with open(json_log_path, "r") as f:
-                logs = json.load(f)
-        else:
-            logs = []
-        
-        logs.append(completion_entry)
-        
-        with open(json_log_path, "w") as f:
-            json.dump(logs, f, indent=2)
-        
+
+        queue_append(COMPLETIONS_JSONL, json_dumps(completion_entry).decode('utf-8') + "\n")
+
         return True
     except Exception:
         return False
 
-def send_mac_notification(message, title="Agent Complete"):
+def send_mac_notification(ctx):
     """Send native Mac notification"""
     try:
         # Check if we're on Mac and in local mode
-        if sys.platform == "darwin" or os.environ.get('NOTIFICATION_MODE') == 'local':
-            # Method 1: osascript (always available on Mac)
+        if IS_MAC_LOCAL:
+            # Method 1: osascript (always available on Mac). Not waited on:
+            # AppleScript evaluation takes tens of ms and nothing reads its output
             sound = os.environ.get('NOTIFICATION_SOUND', 'Glass')
-            applescript = f'''display notification "{message}" with title "{title}" sound name "{sound}"'''
-            subprocess.run(['osascript', '-e', applescript], capture_output=True, timeout=2)
+            applescript = f'''display notification "{ctx.message}" with title "{ctx.title}" sound name "{sound}"'''
+            subprocess.Popen(
+                ['osascript', '-e', applescript],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
             
-            # Method 2: terminal-notifier (if installed via homebrew)
-            try:
+            # Method 2: terminal-notifier (if installed via homebrew);
+            # look it up on PATH instead of spawning and catching the failure
+            terminal_notifier = shutil.which('terminal-notifier')
+            if terminal_notifier:
                 subprocess.run(
-                    ['terminal-notifier', '-title', title, '-message', message, '-sound', 'default'],
+                    [terminal_notifier, '-title', ctx.title, '-message', ctx.message, '-sound', 'default'],
                     capture_output=True,
                     timeout=2
                 )
-            except FileNotFoundError:
-                pass  # terminal-notifier not installed
             
             # Method 3: Voice notification (if enabled)
             if os.environ.get('ENABLE_VOICE_NOTIFICATIONS') == 'true':
-                subprocess.run(['say', message], capture_output=True, timeout=5)
+                subprocess.run(['say', ctx.message], capture_output=True, timeout=5)
             
             return True
     except Exception:
         pass
     return False
 
+def get_enabled_channels():
+    """Read channel credentials once and report which channels are configured."""
+    env = os.environ
+    enabled = {"TCP": bool(env.get('WINDOWS_NOTIFY_IP'))}
+    for entry in WEBHOOKS:
+        enabled[entry["name"]] = all(env.get(var) for var in entry["env"])
+    return enabled
+
+def dispatch_network_notifications(ctx, enabled=None):
+    """Send TCP and webhook notifications in parallel.
+
+    Only channels with credentials configured are attempted. Returns the
+    names of the channels that succeeded, in a stable order.
+    """
+    if enabled is None:
+        enabled = get_enabled_channels()
+
+    senders = [("TCP", send_tcp_notification)] if enabled.get("TCP") else []
+    senders += [
+        (entry["name"], partial(post_webhook, entry))
+        for entry in WEBHOOKS if enabled.get(entry["name"])
+    ]
+    if not senders:
+        return []
+
+    with ThreadPoolExecutor(max_workers=len(senders)) as pool:
+        futures = [(name, pool.submit(sender, ctx)) for name, sender in senders]
+
+    succeeded = []
+    for name, future in futures:
+        try:
+            if future.result():
+                succeeded.append(name)
+        except Exception:
+            pass
+    return succeeded
+
+def detach_from_caller():
+    """Move the remaining notification work into a detached grandchild.
+
+    Returns True in the process that should carry on sending notifications
+    and False in the original process, which can return to Claude straight
+    away. Set NOTIFY_FOREGROUND=1 to keep everything in-process (testing).
+    """
+    if os.environ.get('NOTIFY_FOREGROUND') == '1' or not hasattr(os, 'fork'):
+        return True
+
+    try:
+        pid = os.fork()
+    except OSError:
+        return True
+    if pid != 0:
+        # Reap the intermediate child, which exits right after forking
+        os.waitpid(pid, 0)
+        return False
+
+    # Intermediate child: new session, then fork again so the worker is
+    # reparented to init and never holds the caller's terminal
+    os.setsid()
+    if os.fork() != 0:
+        os._exit(0)
+
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    os.close(devnull)
+    return True
+
 def main():
     try:
         # Read JSON input from stdin
-        data = json.load(sys.stdin)
+        data = json_loads(sys.stdin.buffer.read())
         
         # Extract information with defaults
         agent_name = data.get("agent_name", data.get("subagent_type", "Unknown"))
@@ -326,64 +574,55 @@ def main():
         message = f"Agent '{agent_name}' completed task"
         if task_info and task_info.get("task_id"):
             message = f"Agent '{agent_name}' completed {task_info['task_id']}"
-        
-        # Log the completion
-        log_completion(agent_name, session_id, task_info)
+        ctx = NotificationContext.create(message)
         
         # Send notifications through multiple channels
         # Track which methods succeeded
         methods_tried = []
-        
-        # Method 1: Mac native notification (for local work)
-        if send_mac_notification(message):
-            methods_tried.append("Mac")
-        
-        # Method 2: TCP socket to Windows listener (for remote work)
-        if os.environ.get('WINDOWS_NOTIFY_IP') and send_tcp_notification(message):
-            methods_tried.append("TCP")
-        
-        # Method 3: Write to monitored file
-        if write_notification_file(message):
-            methods_tried.append("File")
-        
-        # Method 4: Pushover (if configured)
-        if send_pushover_notification(message):
-            methods_tried.append("Pushover")
 
-        # Method 5: Slack (if configured)
-        if send_slack_notification(message):
-            methods_tried.append("Slack")
+        # Method 1: Terminal bell (always try this). Run before detaching,
+        # since the background worker no longer has the terminal.
+        if play_terminal_bell():
+            methods_tried.append("Bell")
+
+        # Hand the slow part (subprocesses, network, file I/O) to a detached
+        # process so the hook returns to Claude immediately
+        if not detach_from_caller():
+            return
 
-        # Method 6: Discord (if configured)
-        if send_discord_notification(message):
-            methods_tried.append("Discord")
+        # Log the completion
+        log_completion(ctx, agent_name, session_id, task_info)
 
-        # Method 7: Telegram (if configured)
-        if send_telegram_notification(message):
-            methods_tried.append("Telegram")
+        # Method 2: Mac native notification (for local work)
+        if IS_MAC_LOCAL and send_mac_notification(ctx):
+            methods_tried.append("Mac")
+        
+        # Method 3: TCP listener + Pushover/Slack/Discord/Telegram webhooks,
+        # sent concurrently so latency is the slowest channel, not the sum
+        # (channels without credentials are skipped before any setup)
+        enabled = get_enabled_channels()
+        methods_tried.extend(dispatch_network_notifications(ctx, enabled))
+
+        # Method 4: Write to monitored file
+        if write_notification_file(ctx):
+            methods_tried.append("File")
 
-        # Method 8: tmux notification (if in tmux)
-        if send_tmux_notification(message):
+        # Method 5: tmux notification (if in tmux)
+        if send_tmux_notification(ctx):
             methods_tried.append("tmux")
 
-        # Method 9: Terminal bell (always try this)
-        if play_terminal_bell():
-            methods_tried.append("Bell")
-        
         # Log which notification methods were used
         if methods_tried:
-            debug_log = HOOKS_DIR.parent / "progress/.notification_debug.log"
-            with open(debug_log, "a") as f:
-                f.write(f"{datetime.now().isoformat()} - Sent via: {', '.join(methods_tried)}\n")
-        
+            queue_append(DEBUG_LOG, f"{ctx.now_iso} - Sent via: {', '.join(methods_tried)}\n")
+
     except json.JSONDecodeError:
         # Not valid JSON, exit silently
         pass
     except Exception as e:
         # Log any errors for debugging
-        error_log = HOOKS_DIR.parent / "progress/.notification_errors.log"
-        with open(error_log, "a") as f:
-            f.write(f"{datetime.now().isoformat()} - Error: {str(e)}\n")
+        queue_append(ERROR_LOG, f"{format_timestamps(time.time())[0]} - Error: {str(e)}\n")
+    finally:
+        flush_pending_writes()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
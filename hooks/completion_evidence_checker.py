@@ -19,17 +19,48 @@ Config options in config.json:
 - quick_validate_changes: true/false - Run quick lint on changed files
 """
 
+import atexit
 import json
 import sys
 import os
+import re
 import subprocess
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
 
 # Configuration - use relative paths for portability
 HOOKS_DIR = Path(__file__).parent
 PROJECT_DIR = HOOKS_DIR.parent.parent  # .claude/hooks -> .claude -> project root
+CONFIG_FILE = HOOKS_DIR / "config.json"
 DEBUG_LOG = PROJECT_DIR / "progress/.evidence_checker_debug.log"
+# tsc build info, so repeat quick checks reuse the previous program graph
+TS_BUILD_INFO = PROJECT_DIR / "progress/.evidence_checker.tsbuildinfo"
+DONE_STATUSES = frozenset({"completed", "done"})  # plan item statuses that count as finished
+TS_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx')  # files passed to tsc
+TS_ERROR_RE = re.compile(rb"^.*?error TS\d+.*$", re.MULTILINE)  # one tsc diagnostic line
+
+# Prefix for every git invocation: use commit-graph files for history
+# lookups, and skip optional index locks/refreshes (read-only queries).
+GIT_COMMAND = ["git", "--no-optional-locks", "-c", "core.commitGraph=true"]
+
+# How long a cached changed-files list stays valid within a session. The
+# key only sees HEAD and the index, so unstaged edits age out via the TTL.
+DIFF_CACHE_TTL = 5
+
+# orjson is optional: parses large plan files much faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: libgit2 bindings let us read repo status in-process instead of
+# spawning git; the subprocess path is used when pygit2 isn't installed
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
 
 # Import shared helper for cross-session plan tracking
 try:
@@ -48,22 +79,39 @@ def get_session_files(session_id: str) -> tuple:
     return plan_state_file, stop_attempts_file
 
 
+_debug_fd = None  # opened on first log_debug, closed at exit
+
+
+def _close_debug_fd():
+    if _debug_fd is not None:
+        os.close(_debug_fd)
+
+
+atexit.register(_close_debug_fd)
+
+
 def log_debug(message: str):
-    """Log debug message to file."""
+    """Log debug message to file.
+
+    The log is opened once with O_APPEND and each line is a single
+    os.write, so several log lines per run cost no extra opens.
+    """
+    global _debug_fd
     try:
-        DEBUG_LOG.parent.mkdir(parents=True, exist_ok=True)
-        with open(DEBUG_LOG, "a") as f:
-            f.write(f"[{datetime.now().isoformat()}] {message}\n")
+        if _debug_fd is None:
+            DEBUG_LOG.parent.mkdir(parents=True, exist_ok=True)
+            _debug_fd = os.open(DEBUG_LOG, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        os.write(_debug_fd, f"[{datetime.now().isoformat()}] {message}\n".encode("utf-8"))
     except Exception:
         pass
 
 
+@lru_cache(maxsize=1)
 def load_config() -> dict:
-    """Load config from file."""
-    config_file = HOOKS_DIR / "config.json"
+    """Load config from file (parsed once per process)."""
     try:
-        if config_file.exists():
-            return json.loads(config_file.read_text())
+        if CONFIG_FILE.exists():
+            return json.loads(CONFIG_FILE.read_text())
     except Exception:
         pass
     return {}
@@ -72,52 +120,139 @@ def load_config() -> dict:
 def load_plan_state(plan_state_file: Path) -> dict:
     """Load plan state from file."""
     try:
-        if plan_state_file.exists():
-            return json.loads(plan_state_file.read_text())
+        data = plan_state_file.read_bytes()
+        return orjson.loads(data) if orjson is not None else json.loads(data)
     except Exception:
         pass
     return None
 
 
-def get_recent_file_changes() -> list:
-    """Get list of recently modified files using git.
+def _git(*args: str, timeout: int = 10) -> subprocess.CompletedProcess:
+    """Run a read-only git command in the project root."""
+    return subprocess.run(
+        GIT_COMMAND + list(args),
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        timeout=timeout
+    )
 
-    Returns files that have been modified in the working tree
-    (both staged and unstaged changes).
+
+def get_recent_file_changes_pygit2() -> list | None:
+    """Get staged + unstaged changed paths via libgit2.
+
+    Returns None if pygit2 is unavailable or the repo can't be read, so the
+    caller can fall back to the git subprocess.
     """
+    if pygit2 is None:
+        return None
     try:
-        # Get both staged and unstaged changes
-        result = subprocess.run(
-            ["git", "diff", "--name-only", "HEAD"],
-            cwd=PROJECT_DIR,
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        repo = pygit2.Repository(str(PROJECT_DIR))
+        # Tracked changes only, like `git status --untracked-files=no`; also
+        # skips walking untracked trees such as node_modules
+        return list(repo.status(untracked_files="no"))
+    except Exception as e:
+        log_debug(f"pygit2 status failed, falling back to git: {e}")
+        return None
 
-        if result.returncode == 0 and result.stdout.strip():
-            files = [f.strip() for f in result.stdout.strip().split("\n") if f.strip()]
-            return files
 
-        # Also check for staged changes (in case nothing committed)
-        result_staged = subprocess.run(
-            ["git", "diff", "--name-only", "--cached"],
-            cwd=PROJECT_DIR,
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+def get_diff_cache_key() -> str | None:
+    """Build a cache key from HEAD and the index without spawning git.
 
-        if result_staged.returncode == 0 and result_staged.stdout.strip():
-            files = [f.strip() for f in result_staged.stdout.strip().split("\n") if f.strip()]
-            return files
+    Combines the contents of .git/HEAD, the mtime of the branch ref it
+    points at, and the mtime of .git/index. Returns None when .git is not
+    a plain directory (worktrees, submodules) so callers skip the cache.
+    """
+    git_dir = PROJECT_DIR / ".git"
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+        ref_mtime = 0
+        if head.startswith("ref: "):
+            try:
+                ref_mtime = (git_dir / head[5:]).stat().st_mtime_ns
+            except OSError:
+                pass  # Packed or unborn ref; HEAD text still identifies it
+        try:
+            index_mtime = (git_dir / "index").stat().st_mtime_ns
+        except OSError:
+            index_mtime = 0
+        return f"{head}:{ref_mtime}:{index_mtime}"
+    except OSError:
+        return None
+
+
+def load_diff_cache(session_id: str, key: str) -> list | None:
+    """Return the cached changed-files list if the key matches and is fresh."""
+    cache_file = HOOKS_DIR / "sessions" / f"{session_id}_diff_cache.json"
+    try:
+        if datetime.now().timestamp() - cache_file.stat().st_mtime > DIFF_CACHE_TTL:
+            return None
+        return json.loads(cache_file.read_text()).get(key)
+    except Exception:
+        return None
 
-    except subprocess.TimeoutExpired:
-        log_debug("Git diff timed out")
-    except Exception as e:
-        log_debug(f"Error getting file changes: {e}")
 
-    return []
+def save_diff_cache(session_id: str, key: str, files: list):
+    """Store the changed-files list for this session under the given key."""
+    cache_file = HOOKS_DIR / "sessions" / f"{session_id}_diff_cache.json"
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps({key: files}))
+    except Exception:
+        pass
+
+
+def get_recent_file_changes(session_id: str = None) -> list:
+    """Get list of recently modified files using git.
+
+    Returns files that have been modified in the working tree
+    (both staged and unstaged changes). With a session_id, results are
+    cached per (HEAD, index mtime) for DIFF_CACHE_TTL seconds.
+    """
+    key = get_diff_cache_key() if session_id else None
+    if key:
+        cached = load_diff_cache(session_id, key)
+        if cached is not None:
+            log_debug("Using cached file changes")
+            return cached
+
+    files = get_recent_file_changes_pygit2()
+
+    if files is None:
+        try:
+            # One `git status` covers staged and unstaged changes (and works
+            # before the first commit), instead of two separate `git diff` runs.
+            # -z gives NUL-separated entries with unquoted paths.
+            result = _git("status", "--porcelain=v1", "-z", "--untracked-files=no")
+
+            if result.returncode != 0:
+                return []
+            files = parse_porcelain_z(result.stdout) if result.stdout else []
+
+        except subprocess.TimeoutExpired:
+            log_debug("Git status timed out")
+            return []
+        except Exception as e:
+            log_debug(f"Error getting file changes: {e}")
+            return []
+
+    if key:
+        save_diff_cache(session_id, key, files)
+    return files
+
+
+def parse_porcelain_z(output: str) -> list:
+    """Extract paths from `git status --porcelain=v1 -z` output."""
+    files = []
+    entries = iter(output.split("\0"))
+    for entry in entries:
+        if len(entry) < 4:
+            continue
+        files.append(entry[3:])
+        # Renames/copies are followed by a separate entry for the old path
+        if entry[0] in "RC":
+            next(entries, None)
+    return files
 
 
 def get_session_file_changes(session_id: str) -> list:
@@ -148,7 +283,7 @@ def quick_validate_files(files: list) -> tuple:
         return True, []
 
     # Filter to only TypeScript/JavaScript files
-    ts_files = [f for f in files if f.endswith(('.ts', '.tsx', '.js', '.jsx'))]
+    ts_files = [f for f in files if f.endswith(TS_EXTENSIONS)]
 
     if not ts_files:
         return True, []
@@ -157,25 +292,26 @@ def quick_validate_files(files: list) -> tuple:
     ts_files = ts_files[:10]
 
     try:
-        # Quick type check using tsc
+        # Quick type check using tsc; --incremental lets later runs skip
+        # re-checking files whose dependency graph hasn't changed
+        TS_BUILD_INFO.parent.mkdir(parents=True, exist_ok=True)
         result = subprocess.run(
-            ["npx", "tsc", "--noEmit", "--pretty", "false"] + ts_files,
+            ["npx", "tsc", "--noEmit", "--pretty", "false",
+             "--incremental", "--tsBuildInfoFile", str(TS_BUILD_INFO)] + ts_files,
             cwd=PROJECT_DIR,
             capture_output=True,
-            text=True,
             timeout=30
         )
 
         if result.returncode == 0:
             return True, []
 
-        # Extract error messages
-        errors = []
-        for line in result.stdout.split("\n"):
-            if "error TS" in line:
-                errors.append(line[:150])
-                if len(errors) >= 5:
-                    break
+        # Extract the first few error messages straight from the raw
+        # output, without decoding or splitting all of it
+        errors = [
+            match.group(0)[:150].decode("utf-8", "replace").rstrip("\r")
+            for match in islice(TS_ERROR_RE.finditer(result.stdout), 5)
+        ]
 
         return False, errors
 
@@ -194,7 +330,7 @@ def get_pending_plan_items(plan_state: dict) -> list:
 
     return [
         item for item in plan_state.get("items", [])
-        if item.get("status") not in ["completed", "done"]
+        if item.get("status") not in DONE_STATUSES
         and item.get("actionable") is not False
     ]
 
@@ -207,16 +343,21 @@ def detect_completion_attempts(todos: list, plan_items: list) -> list:
     """
     completing = []
 
+    # Lowercase and split each plan task once, not once per todo
+    plan_index = []
+    for item in plan_items:
+        task = item.get("task", "").lower()
+        plan_index.append((item, task, tuple(task.split()[:3])))
+
     for todo in todos:
         if todo.get("status") == "completed":
             content = todo.get("content", "").lower()
 
             # Check if this matches a pending plan item
-            for item in plan_items:
-                task = item.get("task", "").lower()
+            for item, task, first_words in plan_index:
                 # Simple substring matching
                 if task in content or content in task or \
-                   any(word in content for word in task.split()[:3]):
+                   any(word in content for word in first_words):
                     completing.append({
                         "todo_content": todo.get("content"),
                         "plan_task": item.get("task"),
@@ -238,11 +379,17 @@ def output_hook_response(continue_execution: bool = True, system_message: str =
 def main():
     """Main entry point for the hook."""
     try:
+        # Fast path: without the env flag or a config file the hook can't be
+        # enabled, so skip reading stdin and parsing any JSON
+        env_enabled = os.environ.get("CLAUDE_PLAN_VERIFICATION", "").lower() == "true"
+        if not env_enabled and not os.path.exists(CONFIG_FILE):
+            output_hook_response(True)
+            sys.exit(0)
+
         # Check if evidence checker is enabled
         config = load_config()
 
         # Check both plan_verification and evidence_checker_enabled
-        env_enabled = os.environ.get("CLAUDE_PLAN_VERIFICATION", "").lower() == "true"
         config_enabled = config.get("plan_verification", False)
         evidence_enabled = config.get("evidence_checker_enabled", True)  # Default enabled
 
@@ -297,9 +444,11 @@ def main():
         require_changes = config.get("require_file_changes", False)  # Default: warn only
         quick_validate = config.get("quick_validate_changes", False)  # Default: skip validation
 
-        git_changes = get_recent_file_changes()
+        git_changes = get_recent_file_changes(session_id)
         session_changes = get_session_file_changes(session_id)
-        all_changes = list(set(git_changes + session_changes))
+        # Ordered dedupe: git changes first, so the files quick_validate
+        # picks are stable between runs
+        all_changes = list(dict.fromkeys(chain(git_changes, session_changes)))
 
         log_debug(f"Found {len(all_changes)} file changes")
 
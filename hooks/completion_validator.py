@@ -13,20 +13,44 @@ If issues are found:
 Config options in config.json:
 - auto_code_review: true/false - Enable this hook
 - validation_commands: list of commands to run
+- fail_fast: true/false - Stop the other commands once a required one fails
+  (default: true)
 """
 
+import atexit
+import hashlib
 import json
 import sys
 import os
+import re
+import selectors
+import shutil
+import signal
 import subprocess
+import threading
+import time
+from collections import deque
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+# orjson is optional: parses/serializes plan state much faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuration
 HOOKS_DIR = Path(__file__).parent
 PROJECT_DIR = Path("/Users/norvin/Cursor/bebo-studio/bebo-work")
 DEBUG_LOG = HOOKS_DIR.parent / "progress/.completion_validator_debug.log"
 VALIDATION_LOG = HOOKS_DIR.parent / "progress/validation_results.log"
+VALIDATION_CACHE = HOOKS_DIR / ".validation_cache.json"
+
+# Prefix for every git invocation: git resolved on PATH once, commit-graph
+# files for history lookups, and no optional index locks/refreshes
+# (read-only queries).
+GIT_COMMAND = [shutil.which("git") or "git", "--no-optional-locks", "-c", "core.commitGraph=true"]
 
 
 def get_session_files(session_id: str) -> tuple:
@@ -39,6 +63,19 @@ def get_session_files(session_id: str) -> tuple:
 
     return plan_state_file, stop_attempts_file
 
+# A line reporting an error: TypeScript "error TS1234", or "error" next to a
+# ":" / "✖" marker (ESLint, bundlers, compilers), in any case
+ERROR_LINE_RE = re.compile(r"(?-i:error TS)|error.*[:✖]|[:✖].*error", re.IGNORECASE)
+# tsc: "src/a.ts(3,5): error TS2322: ..." or, with --pretty, "src/a.ts:3:5 - error TS2322: ..."
+TSC_ERROR_RE = re.compile(r"\S.*(?:\(\d+,\d+\):|:\d+:\d+ -) error TS\d+")
+# ESLint stylish ("  3:5  error  msg  rule") or compact ("a.js: line 3, col 5, Error - msg")
+ESLINT_ERROR_RE = re.compile(r"\s+\d+:\d+\s+error\s|\S.*: line \d+, col \d+, Error - ")
+MAX_LINE_LENGTH = 10_000  # longer lines (minified bundles, JSON dumps) are skipped
+MAX_TOTAL_ERRORS = 100  # stop scanning output after this many error lines
+MAX_UNIQUE_ERRORS = 10  # distinct error lines reported per validation
+OUTPUT_TAIL_LINES = 200  # lines of stdout/stderr kept per validation command
+OUTPUT_TAIL_BYTES = 2000  # bytes of that tail decoded and stored in the result
+
 # Default validation commands
 DEFAULT_VALIDATIONS = [
     {
@@ -62,53 +99,145 @@ DEFAULT_VALIDATIONS = [
 ]
 
 
+_ts_cache = [0, ""]  # [epoch second, its ISO string]
+
+
+def now_iso() -> str:
+    """Local time as an ISO string, formatted at most once per second."""
+    t = int(time.time())
+    if t != _ts_cache[0]:
+        _ts_cache[1] = datetime.fromtimestamp(t).isoformat()
+        _ts_cache[0] = t
+    return _ts_cache[1]
+
+
+def json_loads(data):
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes.
+
+    Compact by default; set HOOKS_PRETTY_JSON=1 for 2-space indentation
+    when the files need to be read by hand.
+    """
+    pretty = bool(os.environ.get("HOOKS_PRETTY_JSON"))
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None)
+        except TypeError:
+            pass  # e.g. non-str keys; stdlib json handles those
+    if pretty:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+# Validation results are buffered and written in one append at exit; the
+# debug log is written through a cached descriptor so its lines survive
+# the hook being killed (e.g. on a hook timeout), when they matter most
+_LOG_BUFFERS = {VALIDATION_LOG: []}
+_debug_fd = None
+
+
+def flush_logs():
+    """Append all buffered log lines, one write per log file."""
+    made_dirs = set()
+    for path, lines in _LOG_BUFFERS.items():
+        if not lines:
+            continue
+        try:
+            if path.parent not in made_dirs:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                made_dirs.add(path.parent)
+            # Raw O_APPEND descriptor: one open, one write, one close
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, "".join(lines).encode("utf-8"))
+            finally:
+                os.close(fd)
+            lines.clear()
+        except Exception:
+            pass
+
+
+def close_debug_log():
+    if _debug_fd is not None:
+        os.close(_debug_fd)
+
+
+atexit.register(flush_logs)
+atexit.register(close_debug_log)
+
+
 def log_debug(message: str):
-    """Log debug message to file."""
+    """Log debug message to file (one os.write per line)."""
+    global _debug_fd
     try:
-        DEBUG_LOG.parent.mkdir(parents=True, exist_ok=True)
-        with open(DEBUG_LOG, "a") as f:
-            f.write(f"[{datetime.now().isoformat()}] {message}\n")
+        if _debug_fd is None:
+            DEBUG_LOG.parent.mkdir(parents=True, exist_ok=True)
+            _debug_fd = os.open(DEBUG_LOG, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        os.write(_debug_fd, f"[{now_iso()}] {message}\n".encode("utf-8"))
     except Exception:
         pass
 
 
 def log_validation(message: str):
     """Log validation results."""
+    _LOG_BUFFERS[VALIDATION_LOG].append(f"[{now_iso()}] {message}\n")
+
+
+@lru_cache(maxsize=1)
+def _load_config_cached(config_file: Path, mtime_ns: int) -> dict:
+    """Parse config.json; cached per (path, mtime) so edits are picked up."""
     try:
-        VALIDATION_LOG.parent.mkdir(parents=True, exist_ok=True)
-        with open(VALIDATION_LOG, "a") as f:
-            f.write(f"[{datetime.now().isoformat()}] {message}\n")
+        return json_loads(config_file.read_bytes())
     except Exception:
-        pass
+        return {}
 
 
 def load_config() -> dict:
     """Load config from file."""
     config_file = HOOKS_DIR / "config.json"
     try:
-        if config_file.exists():
-            return json.loads(config_file.read_text())
-    except Exception:
-        pass
-    return {}
+        return _load_config_cached(config_file, config_file.stat().st_mtime_ns)
+    except OSError:
+        return {}
 
 
 def load_plan_state(plan_state_file: Path) -> dict:
     """Load plan state from file."""
     try:
-        if plan_state_file.exists():
-            return json.loads(plan_state_file.read_text())
+        return json_loads(plan_state_file.read_bytes())
     except Exception:
         pass
     return None
 
 
+_plan_state_dirty = False  # set when this run changes the plan state
+
+
 def save_plan_state(state: dict, plan_state_file: Path):
-    """Save plan state to file."""
+    """Save plan state to file, if this run changed it.
+
+    Written to a temp file and renamed into place, so a failed write
+    leaves the previous plan state intact.
+    """
+    global _plan_state_dirty
+    if not _plan_state_dirty:
+        return
     try:
         plan_state_file.parent.mkdir(parents=True, exist_ok=True)
-        state["updated_at"] = datetime.now().isoformat()
-        plan_state_file.write_text(json.dumps(state, indent=2))
+        state["updated_at"] = now_iso()
+        tmp_file = plan_state_file.with_name(f".{plan_state_file.name}.{os.getpid()}.tmp")
+        try:
+            tmp_file.write_bytes(json_dumps(state))
+            os.replace(tmp_file, plan_state_file)
+        finally:
+            tmp_file.unlink(missing_ok=True)
+        _plan_state_dirty = False
     except Exception as e:
         log_debug(f"Error saving plan state: {e}")
 
@@ -123,15 +252,162 @@ def has_incomplete_items(plan_state: dict) -> bool:
     return False
 
 
-def run_validation(validation: dict) -> dict:
-    """Run a single validation command."""
+# Set once a required validation fails (fail-fast); running commands in
+# _RUNNING are killed and not-yet-started ones are skipped
+_CANCELLED = threading.Event()
+_RUNNING = set()
+_RUNNING_LOCK = threading.Lock()
+
+
+def kill_process_group(process: subprocess.Popen):
+    """Kill a validation command along with everything its shell started."""
+    try:
+        # Each command runs in its own session, so its pgid is its pid
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, OSError):
+        try:
+            process.kill()
+        except OSError:
+            pass
+
+
+def cancel_validations():
+    """Kill every validation command still running."""
+    _CANCELLED.set()
+    with _RUNNING_LOCK:
+        for process in _RUNNING:
+            kill_process_group(process)
+
+
+def drain_output(process, deadline: float) -> tuple[deque, deque, bool]:
+    """Read stdout and stderr to EOF on this thread, keeping only the tails.
+
+    Both pipes are multiplexed with a selector, so no reader threads are
+    needed. Returns (stdout_tail, stderr_tail, timed_out); timed_out means
+    the deadline passed before the output ended.
+    """
+    tails = {
+        process.stdout.fileno(): deque(maxlen=OUTPUT_TAIL_LINES),
+        process.stderr.fileno(): deque(maxlen=OUTPUT_TAIL_LINES),
+    }
+    partial = {fd: b"" for fd in tails}
+    exited_at = None
+
+    with selectors.DefaultSelector() as sel:
+        for fd in tails:
+            os.set_blocking(fd, False)
+            sel.register(fd, selectors.EVENT_READ)
+
+        while sel.get_map():
+            now = time.monotonic()
+            if exited_at is None and process.poll() is not None:
+                exited_at = now
+            # Children of the shell may keep the pipes open after it exits;
+            # give them a moment, then stop reading
+            if exited_at is not None and now - exited_at > 1:
+                break
+            if now >= deadline:
+                return tails[process.stdout.fileno()], tails[process.stderr.fileno()], True
+
+            # Short waits so the shell exiting is noticed promptly
+            for key, _ in sel.select(min(deadline - now, 0.5)):
+                fd = key.fd
+                try:
+                    chunk = os.read(fd, 65536)
+                except BlockingIOError:
+                    continue
+                if not chunk:
+                    sel.unregister(fd)
+                    continue
+                *lines, rest = (partial[fd] + chunk).split(b"\n")
+                tails[fd].extend(line + b"\n" for line in lines)
+                # Only the end of one enormous line can ever be reported
+                partial[fd] = rest[-OUTPUT_TAIL_BYTES:]
+
+    for fd, rest in partial.items():
+        if rest:
+            tails[fd].append(rest)
+    return tails[process.stdout.fileno()], tails[process.stderr.fileno()], False
+
+
+def compute_tree_hash() -> str | None:
+    """Fingerprint the project's source files by path, mtime and size.
+
+    Covers tracked and untracked-but-not-ignored files (so new files
+    count), skipping .claude/ where the hooks write their own logs.
+    Returns None outside a git repo, which disables the result cache.
+    """
+    try:
+        listing = subprocess.run(
+            GIT_COMMAND + ["ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            cwd=PROJECT_DIR,
+            capture_output=True,
+            timeout=30
+        )
+        if listing.returncode != 0:
+            return None
+    except Exception as e:
+        log_debug(f"Could not list files for tree hash: {e}")
+        return None
+
+    digest = hashlib.blake2b(digest_size=16)
+    for rel_path in sorted(set(listing.stdout.split(b"\0"))):
+        if not rel_path or rel_path.startswith(b".claude/"):
+            continue
+        try:
+            st = os.stat(os.path.join(PROJECT_DIR, os.fsdecode(rel_path)))
+        except OSError:
+            continue  # Deleted but still in the index
+        digest.update(b"%s %d %d\n" % (rel_path, st.st_mtime_ns, st.st_size))
+    return digest.hexdigest()
+
+
+def load_validation_cache() -> dict:
+    """Load {validation_name: {hash, command, success, timestamp}}."""
+    try:
+        return json_loads(VALIDATION_CACHE.read_bytes())
+    except Exception:
+        return {}
+
+
+def save_validation_cache(results: list, tree_hash: str):
+    """Record which validations passed on this tree; drop ones that didn't."""
+    cache = load_validation_cache()
+    for result in results:
+        if result.get("cancelled") or result.get("cached"):
+            continue
+        if result["success"]:
+            cache[result["name"]] = {
+                "hash": tree_hash,
+                "command": result["command"],
+                "success": True,
+                "timestamp": now_iso()
+            }
+        else:
+            cache.pop(result["name"], None)
+    # Temp file + rename, so a crash or a concurrent hook never leaves a
+    # truncated cache behind
+    tmp_file = VALIDATION_CACHE.with_name(f".{VALIDATION_CACHE.name}.{os.getpid()}.tmp")
+    try:
+        tmp_file.write_bytes(json_dumps(cache))
+        os.replace(tmp_file, VALIDATION_CACHE)
+    except Exception as e:
+        log_debug(f"Error saving validation cache: {e}")
+    finally:
+        tmp_file.unlink(missing_ok=True)
+
+
+def run_validation(validation: dict, tree_hash: str = None, cache: dict = None) -> dict:
+    """Run a single validation command.
+
+    If it already passed on an identical source tree (same tree_hash and
+    command in cache), the cached pass is returned without running it.
+    """
     name = validation.get("name", "Unknown")
     command = validation.get("command", "")
     timeout = validation.get("timeout", 60)
     required = validation.get("required", True)
 
-    log_debug(f"Running validation: {name}")
-
     result = {
         "name": name,
         "command": command,
@@ -141,26 +417,73 @@ def run_validation(validation: dict) -> dict:
         "error": ""
     }
 
+    cached = (cache or {}).get(name)
+    if tree_hash and cached and cached.get("success") \
+            and cached.get("hash") == tree_hash and cached.get("command") == command:
+        log_debug(f"{name}: PASS (cached, tree unchanged since {cached.get('timestamp')})")
+        result["success"] = True
+        result["cached"] = True
+        return result
+
+    log_debug(f"Running validation: {name}")
+
+    if _CANCELLED.is_set():
+        result["cancelled"] = True
+        return result
+
     try:
-        process = subprocess.run(
+        # Stream output into bounded tails instead of buffering all of it;
+        # a verbose build can print far more than we ever look at
+        process = subprocess.Popen(
             command,
             shell=True,
             cwd=PROJECT_DIR,
-            capture_output=True,
-            text=True,
-            timeout=timeout
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            # Own process group, so a timeout or cancel can kill the whole
+            # `npm ... || bun ...` pipeline and not just the shell
+            start_new_session=True
         )
+        with _RUNNING_LOCK:
+            _RUNNING.add(process)
+        if _CANCELLED.is_set():
+            kill_process_group(process)
+        try:
+            deadline = time.monotonic() + timeout
+            stdout_tail, stderr_tail, timed_out = drain_output(process, deadline)
+            if not timed_out:
+                # The command may close or redirect its pipes and keep
+                # running, so the deadline still applies after EOF
+                try:
+                    process.wait(timeout=max(0, deadline - time.monotonic()))
+                except subprocess.TimeoutExpired:
+                    timed_out = True
+            if timed_out:
+                kill_process_group(process)
+                process.wait(timeout=5)
+                result["error"] = f"Timeout after {timeout}s"
+                log_debug(f"{name}: TIMEOUT")
+                return result
+        finally:
+            process.stdout.close()
+            process.stderr.close()
+            with _RUNNING_LOCK:
+                _RUNNING.discard(process)
+
+        # Killed by cancel_validations (negative code = terminated by signal)
+        if process.returncode < 0 and _CANCELLED.is_set():
+            result["cancelled"] = True
+            log_debug(f"{name}: CANCELLED")
+            return result
 
         result["success"] = process.returncode == 0
-        result["output"] = process.stdout[-2000:] if process.stdout else ""  # Last 2000 chars
-        result["error"] = process.stderr[-2000:] if process.stderr else ""
+        # Output stays raw bytes while streaming; only the kept tail is decoded
+        result["output"] = b"".join(stdout_tail)[-OUTPUT_TAIL_BYTES:].decode("utf-8", "replace")
+        result["error"] = b"".join(stderr_tail)[-OUTPUT_TAIL_BYTES:].decode("utf-8", "replace")
         result["returncode"] = process.returncode
 
         log_debug(f"{name}: {'PASS' if result['success'] else 'FAIL'} (code: {process.returncode})")
 
-    except subprocess.TimeoutExpired:
-        result["error"] = f"Timeout after {timeout}s"
-        log_debug(f"{name}: TIMEOUT")
     except Exception as e:
         result["error"] = str(e)
         log_debug(f"{name}: ERROR - {e}")
@@ -168,67 +491,134 @@ def run_validation(validation: dict) -> dict:
     return result
 
 
-def extract_errors(output: str, error: str) -> list:
-    """Extract error messages from command output."""
-    errors = []
+def _scan_errors(output: str, error: str, is_error) -> list:
+    """Collect unique lines of command output for which is_error(line) is true."""
+    seen = set()
+    unique_errors = []
+    matches = 0
     combined = (output + "\n" + error).strip()
 
-    # Look for common error patterns
+    # Deduplicate as we go and stop once we have enough
     for line in combined.split("\n"):
-        line = line.strip()
-        if not line:
+        if len(line) > MAX_LINE_LENGTH:
             continue
+        if is_error(line):
+            err = line.strip()[:200]
+            if err not in seen:
+                seen.add(err)
+                unique_errors.append(err)
+                if len(unique_errors) >= MAX_UNIQUE_ERRORS:
+                    break
+            matches += 1
+            if matches >= MAX_TOTAL_ERRORS:
+                break
 
-        # TypeScript errors
-        if "error TS" in line or ": error:" in line.lower():
-            errors.append(line[:200])
+    return unique_errors
 
-        # ESLint errors
-        elif "error" in line.lower() and (":" in line or "✖" in line):
-            errors.append(line[:200])
 
-        # Build errors
-        elif "Error:" in line or "error:" in line:
-            errors.append(line[:200])
+def extract_errors(output: str, error: str) -> list:
+    """Extract unique error messages from command output."""
+    # Look for common error patterns (TypeScript, ESLint, build errors)
+    return _scan_errors(output, error, ERROR_LINE_RE.search)
 
-    # Deduplicate and limit
-    seen = set()
-    unique_errors = []
-    for err in errors:
-        if err not in seen:
-            seen.add(err)
-            unique_errors.append(err)
-            if len(unique_errors) >= 10:
-                break
 
-    return unique_errors
+def _extract_tsc(output: str, error: str) -> list:
+    """Extract `file(line,col): error TSnnnn` diagnostics from tsc output."""
+    # Anything else (missing script, crashed compiler) goes to the generic scan
+    return _scan_errors(output, error, TSC_ERROR_RE.match) or extract_errors(output, error)
+
+
+def _extract_eslint(output: str, error: str) -> list:
+    """Extract error-severity problems from ESLint stylish or compact output."""
+    return _scan_errors(output, error, ESLINT_ERROR_RE.match) or extract_errors(output, error)
+
+
+# Validation name -> error extractor; unknown names use extract_errors
+_EXTRACTORS = {
+    "TypeScript Check": _extract_tsc,
+    "ESLint": _extract_eslint,
+    "Lint": _extract_eslint,
+    "Build": extract_errors,
+}
 
 
-def add_fix_tasks_to_plan(plan_state: dict, errors: list, validation_name: str) -> dict:
-    """Add fix tasks to plan state."""
+def next_item_id(plan_state: dict) -> int:
+    """Allocate the next plan item id from the stored next_id counter.
+
+    Other hooks append items using max(id) + 1 without updating the
+    counter, so it is checked against the last item's id (O(1)). Only
+    plans saved before the counter existed need a full scan.
+    """
+    items = plan_state.get("items", [])
+    if "next_id" in plan_state:
+        next_id = plan_state["next_id"]
+        if items:
+            next_id = max(next_id, items[-1].get("id", 0) + 1)
+    else:
+        next_id = max((i.get("id", 0) for i in items), default=0) + 1
+    plan_state["next_id"] = next_id + 1
+    return next_id
+
+
+def group_errors_by_validation(all_errors: list) -> dict:
+    """Group (validation_name, error) pairs into {validation_name: [errors]}."""
+    grouped = {}
+    for name, err in all_errors:
+        grouped.setdefault(name, []).append(err)
+    return grouped
+
+
+def add_fix_tasks_to_plan(plan_state: dict, grouped_errors: dict) -> dict:
+    """Add one fix task per failed validation to plan state.
+
+    A validation with an empty error list (a timeout, a crash, or output
+    with no recognisable error lines) still gets a task.
+    """
+    global _plan_state_dirty
+    if not grouped_errors:
+        return plan_state
     if not plan_state:
         plan_state = {"items": []}
 
     items = plan_state.get("items", [])
-    max_id = max([i.get("id", 0) for i in items], default=0)
-
-    # Add a single fix task for this validation
-    max_id += 1
-    fix_task = {
-        "id": max_id,
-        "task": f"Fix {validation_name} errors ({len(errors)} issues)",
-        "status": "pending",
-        "added_by": "completion_validator",
-        "errors": errors[:5],  # Include first 5 errors for context
-        "created_at": datetime.now().isoformat()
-    }
-    items.append(fix_task)
+    created_at = now_iso()
+
+    for validation_name, errors in grouped_errors.items():
+        if errors:
+            task = f"Fix {validation_name} errors ({len(errors)} issues)"
+        else:
+            task = f"Fix {validation_name} (failed with no parseable errors / timed out)"
+        items.append({
+            "id": next_item_id(plan_state),
+            "task": task,
+            "status": "pending",
+            "added_by": "completion_validator",
+            "errors": errors[:5],  # Include first 5 errors for context
+            "created_at": created_at
+        })
 
     plan_state["items"] = items
     plan_state["validation_failed"] = True
+    _plan_state_dirty = True
     return plan_state
 
 
+SESSION_ID_RE = re.compile(rb'"session_id"\s*:\s*"([^"\\]*)"')
+
+
+def read_session_id(payload: bytes) -> str:
+    """Get session_id from the hook's stdin payload.
+
+    A plain (unescaped) session id is matched without parsing the whole
+    payload; anything else falls back to a full JSON parse.
+    """
+    match = SESSION_ID_RE.search(payload)
+    if match:
+        return match.group(1).decode("utf-8")
+    data = json_loads(payload)
+    return data.get("session_id", "default") if isinstance(data, dict) else "default"
+
+
 def output_hook_response(continue_execution: bool = True, system_message: str = None):
     """Output JSON response for hook system."""
     response = {"continue": continue_execution}
@@ -247,9 +637,9 @@ def main():
             output_hook_response(True)
             sys.exit(0)
 
-        # Read JSON input from stdin
-        data = json.load(sys.stdin)
-        session_id = data.get("session_id", "default")
+        # Only the session id is needed from stdin, and it is needed before
+        # anything else (to find the plan state); pull it out directly
+        session_id = read_session_id(sys.stdin.buffer.read())
 
         log_debug(f"Completion validator triggered for session: {session_id}")
 
@@ -283,10 +673,40 @@ def main():
         failed_validations = []
         all_errors = []
 
-        for validation in validations:
-            result = run_validation(validation)
+        # Imported here: only needed once there is something to validate,
+        # so the common skip paths above don't pay for it
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        fail_fast = config.get("fail_fast", True)
+
+        # Validations that passed on this exact source tree are skipped
+        tree_hash = compute_tree_hash()
+        cache = load_validation_cache() if tree_hash else {}
+
+        # The commands are independent and mostly wait on subprocesses, so
+        # run them side by side
+        with ThreadPoolExecutor(max_workers=max(1, len(validations))) as pool:
+            futures = [pool.submit(run_validation, v, tree_hash, cache) for v in validations]
+            for future in as_completed(futures):
+                result = future.result()
+                if fail_fast and result["required"] and not result["success"] \
+                        and not result.get("cancelled"):
+                    log_debug(f"{result['name']} failed, cancelling remaining validations")
+                    cancel_validations()
+
+        results = [future.result() for future in futures]
+        if tree_hash:
+            save_validation_cache(results, tree_hash)
+
+        # Report in config order
+        for result in results:
+            if result.get("cancelled"):
+                log_validation(f"{result['name']}: ⏭ SKIPPED (fail-fast)")
+                continue
 
             status = "✅ PASS" if result["success"] else "❌ FAIL"
+            if result.get("cached"):
+                status += " (cached)"
             log_validation(f"{result['name']}: {status}")
 
             if not result["success"]:
@@ -295,7 +715,8 @@ def main():
                     failed_validations.append(result["name"])
 
                 # Extract specific errors
-                errors = extract_errors(result["output"], result["error"])
+                extract = _EXTRACTORS.get(result["name"], extract_errors)
+                errors = extract(result["output"], result["error"])
                 if errors:
                     all_errors.extend([(result["name"], err) for err in errors])
                     log_validation(f"  Errors: {len(errors)} found")
@@ -318,8 +739,10 @@ def main():
 
             # Add fix tasks to plan
             if plan_state:
-                for name, err in all_errors[:5]:  # First 5 unique errors
-                    plan_state = add_fix_tasks_to_plan(plan_state, [err], name)
+                grouped_errors = group_errors_by_validation(all_errors)
+                for name in failed_validations:
+                    grouped_errors.setdefault(name, [])
+                plan_state = add_fix_tasks_to_plan(plan_state, grouped_errors)
                 save_plan_state(plan_state, plan_state_file)
 
             # Build error summary
@@ -15,22 +15,23 @@ Enhanced to provide:
 - TodoWrite-ready JSON for immediate sync
 """
 
+import atexit
 import json
+import re
 import sys
 import os
-from datetime import datetime
+import time
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuration - use relative paths for portability
 HOOKS_DIR = Path(__file__).parent
 DEBUG_LOG = HOOKS_DIR.parent.parent / "progress/.continuation_debug.log"
-
-# Import shared helper for cross-session plan tracking
-try:
-    from plan_session_helper import load_plan_state_with_fallback
-    HAS_HELPER = True
-except ImportError:
-    HAS_HELPER = False
+DONE_STATUSES = frozenset({"completed", "done"})  # plan item statuses that count as finished
 
 
 def get_session_files(session_id: str) -> tuple:
@@ -44,61 +45,151 @@ def get_session_files(session_id: str) -> tuple:
     return plan_state_file, stop_attempts_file
 
 
-def log_debug(message: str):
-    """Log debug message to file."""
+_ts_cache = [0, ""]  # [epoch second, its ISO string]
+
+
+def now_iso() -> str:
+    """Local time as an ISO string, formatted at most once per second."""
+    t = int(time.time())
+    if t != _ts_cache[0]:
+        _ts_cache[1] = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(t))
+        _ts_cache[0] = t
+    return _ts_cache[1]
+
+
+# Debug lines are buffered and appended in one write when the hook exits;
+# these hooks are short-lived and exit through sys.exit or by returning
+_debug_buffer = []
+
+
+def flush_debug_log():
+    """Append all buffered debug lines with a single write."""
+    if not _debug_buffer:
+        return
     try:
         DEBUG_LOG.parent.mkdir(parents=True, exist_ok=True)
-        with open(DEBUG_LOG, "a") as f:
-            f.write(f"[{datetime.now().isoformat()}] {message}\n")
+        fd = os.open(DEBUG_LOG, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, "".join(_debug_buffer).encode("utf-8"))
+        finally:
+            os.close(fd)
     except Exception:
         pass
+    _debug_buffer.clear()
+
+
+atexit.register(flush_debug_log)
+
+
+def log_debug(message: str):
+    """Log debug message to file (buffered until exit)."""
+    _debug_buffer.append(f"[{now_iso()}] {message}\n")
+
+
+def json_loads(data):
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, optionally 2-space indented."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+        except TypeError:
+            pass  # e.g. non-str keys; stdlib json handles those
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+# Parsed state files, keyed by path: ((st_mtime_ns, st_size), data)
+_CACHE: dict = {}
+
+
+def load_json_cached(path: Path):
+    """Parse a JSON file, reusing the result while its mtime and size are unchanged."""
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    data = json_loads(path.read_bytes())
+    _CACHE[path] = (key, data)
+    return data
 
 
 def load_plan_state(plan_state_file: Path) -> dict:
     """Load plan state from file."""
     try:
-        if plan_state_file.exists():
-            return json.loads(plan_state_file.read_text())
+        return load_json_cached(plan_state_file)
     except Exception:
-        pass
-    return None
+        return None
+
+
+ATTEMPTS_RE = re.compile(rb'"attempts"\s*:\s*(\d+)')
 
 
 def load_stop_attempts(stop_attempts_file: Path) -> int:
-    """Load stop attempts count for the session."""
+    """Load stop attempts count for the session.
+
+    stop_verifier writes {"attempts": N, "_last_updated": ...}; the count is
+    picked out of the raw bytes, since nothing else in the file is needed.
+    """
     try:
-        if stop_attempts_file.exists():
-            data = json.loads(stop_attempts_file.read_text())
-            return data.get("attempts", 0)
+        match = ATTEMPTS_RE.search(stop_attempts_file.read_bytes())
     except Exception:
-        pass
-    return 0
+        return 0
+    return int(match.group(1)) if match else 0
 
 
-def get_incomplete_items(plan_state: dict) -> list:
-    """Get incomplete ACTIONABLE items from plan state.
+_partition_cache = (None, None)  # (items list, its partition)
+
 
-    Filters out non-actionable items (templates, categories) so only
-    real tasks are counted.
+def partition_items(plan_state: dict) -> tuple:
+    """Split ACTIONABLE plan items into (actionable, completed, incomplete).
+
+    Non-actionable items (templates, categories) are left out so only real
+    tasks are counted. The result is computed in one pass and reused while
+    the same items list is passed in.
     """
-    if not plan_state or not plan_state.get("items"):
-        return []
-    return [
-        item for item in plan_state.get("items", [])
-        if item.get("status") not in ["completed", "done"]
-        and item.get("actionable") is not False  # Skip templates/categories
-    ]
+    global _partition_cache
+    items = plan_state.get("items") if plan_state else None
+    if not items:
+        return [], [], []
+    if _partition_cache[0] is items:
+        return _partition_cache[1]
+
+    actionable, completed, incomplete = [], [], []
+    for item in items:
+        if item.get("actionable") is False:  # Skip templates/categories
+            continue
+        actionable.append(item)
+        (completed if item.get("status") in DONE_STATUSES else incomplete).append(item)
+
+    _partition_cache = (items, (actionable, completed, incomplete))
+    return actionable, completed, incomplete
+
+
+def get_incomplete_items(plan_state: dict) -> list:
+    """Get incomplete ACTIONABLE items from plan state."""
+    return partition_items(plan_state)[2]
 
 
 def get_completed_items(plan_state: dict) -> list:
     """Get completed ACTIONABLE items from plan state."""
-    if not plan_state or not plan_state.get("items"):
-        return []
-    return [
-        item for item in plan_state.get("items", [])
-        if item.get("status") in ["completed", "done"]
-        and item.get("actionable") is not False
-    ]
+    return partition_items(plan_state)[1]
+
+
+# Leading verb -> present participle, for TodoWrite activeForm
+VERB_ACTIVE_FORMS = {
+    "fix": "Fixing", "add": "Adding", "create": "Creating", "update": "Updating",
+    "run": "Running", "test": "Testing", "deploy": "Deploying", "implement": "Implementing",
+    "modify": "Modifying", "remove": "Removing", "delete": "Deleting", "refactor": "Refactoring",
+    "write": "Writing", "read": "Reading", "build": "Building", "configure": "Configuring",
+    "setup": "Setting up", "set up": "Setting up", "check": "Checking", "verify": "Verifying",
+    "review": "Reviewing", "analyze": "Analyzing", "debug": "Debugging", "optimize": "Optimizing",
+    "install": "Installing", "migrate": "Migrating", "integrate": "Integrating",
+}
 
 
 def task_to_active_form(task: str) -> str:
@@ -106,16 +197,6 @@ def task_to_active_form(task: str) -> str:
     if not task:
         return task
 
-    verb_mappings = {
-        "fix": "Fixing", "add": "Adding", "create": "Creating", "update": "Updating",
-        "run": "Running", "test": "Testing", "deploy": "Deploying", "implement": "Implementing",
-        "modify": "Modifying", "remove": "Removing", "delete": "Deleting", "refactor": "Refactoring",
-        "write": "Writing", "read": "Reading", "build": "Building", "configure": "Configuring",
-        "setup": "Setting up", "set up": "Setting up", "check": "Checking", "verify": "Verifying",
-        "review": "Reviewing", "analyze": "Analyzing", "debug": "Debugging", "optimize": "Optimizing",
-        "install": "Installing", "migrate": "Migrating", "integrate": "Integrating",
-    }
-
     words = task.split()
     if not words:
         return task
@@ -124,8 +205,8 @@ def task_to_active_form(task: str) -> str:
     if first_word.endswith("ing"):
         return task.capitalize() if task[0].islower() else task
 
-    if first_word in verb_mappings:
-        words[0] = verb_mappings[first_word]
+    if first_word in VERB_ACTIVE_FORMS:
+        words[0] = VERB_ACTIVE_FORMS[first_word]
         return " ".join(words)
 
     return task.capitalize() if task[0].islower() else task
@@ -142,10 +223,8 @@ def format_full_plan_context(plan_state: dict, incomplete: list) -> str:
     - TodoWrite-ready JSON
     """
     plan_name = plan_state.get("name", "Current Plan")
-    all_items = plan_state.get("items", [])
-    actionable = [i for i in all_items if i.get("actionable") is not False]
-    completed_items = get_completed_items(plan_state)
 
+    actionable, completed_items, _ = partition_items(plan_state)
     total = len(actionable)
     completed = len(completed_items)
 
@@ -164,15 +243,23 @@ def format_full_plan_context(plan_state: dict, incomplete: list) -> str:
             msg_parts.append(f"- {task}")
         msg_parts.append("")
 
-    # Show remaining tasks with START HERE marker
+    # Show remaining tasks with START HERE marker, collecting the
+    # TodoWrite-ready entries for them in the same pass
+    todos = []
     if incomplete:
         msg_parts.append("⏳ REMAINING (your current work):")
         for i, item in enumerate(incomplete):
             task = item.get("task", "Unknown")
-            status = item.get("status", "pending")
-            status_icon = "🔄" if status == "in_progress" else "[ ]"
+            in_progress = item.get("status", "pending") == "in_progress"
+            status_icon = "🔄" if in_progress else "[ ]"
             start_marker = " ← START HERE" if i == 0 else ""
             msg_parts.append(f"{i+1}. {status_icon} {task}{start_marker}")
+            task = item.get("task", "")
+            todos.append({
+                "content": task,
+                "status": "in_progress" if in_progress else "pending",
+                "activeForm": task_to_active_form(task)
+            })
         msg_parts.append("")
 
     # Add last activity timestamp if available
@@ -180,6 +267,7 @@ def format_full_plan_context(plan_state: dict, incomplete: list) -> str:
     if updated_at:
         try:
             # Parse and format timestamp
+            from datetime import datetime
             dt = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
             msg_parts.append(f"Last activity: {dt.strftime('%Y-%m-%d %H:%M')}")
         except Exception:
@@ -193,42 +281,56 @@ def format_full_plan_context(plan_state: dict, incomplete: list) -> str:
     ])
 
     # Add TodoWrite-ready JSON for immediate sync
-    todos = []
-    for item in incomplete:
-        task = item.get("task", "")
-        status = item.get("status", "pending")
-        todos.append({
-            "content": task,
-            "status": "in_progress" if status == "in_progress" else "pending",
-            "activeForm": task_to_active_form(task)
-        })
-
     msg_parts.extend([
         "---",
         "## 📝 Initialize TodoWrite",
         "Call `TodoWrite` with these items to track progress:",
         "",
         "```json",
-        json.dumps(todos, indent=2),
+        json_dumps(todos, indent=True).decode("utf-8"),
         "```"
     ])
 
     return "\n".join(msg_parts)
 
 
+SESSION_ID_RE = re.compile(rb'"session_id"\s*:\s*"([^"\\]*)"')
+
+
+def has_plan_state(session_id: str) -> bool:
+    """Check whether any plan this hook could report on exists.
+
+    That is the session's own plan state or the active plan that
+    plan_session_helper falls back to. Stop attempts alone never produce
+    a message.
+    """
+    sessions_dir = HOOKS_DIR / "sessions"
+    return (sessions_dir / f"{session_id}_plan_state.json").exists() \
+        or (sessions_dir / "active_plan.json").exists()
+
+
 def output_hook_response(continue_execution: bool = True, system_message: str = None):
     """Output JSON response for hook system."""
     response = {"continue": continue_execution}
     if system_message:
         response["systemMessage"] = system_message
-    print(json.dumps(response))
+    sys.stdout.buffer.write(json_dumps(response) + b"\n")
 
 
 def main():
     """Main entry point for the hook."""
     try:
         # Read JSON input from stdin
-        data = json.load(sys.stdin)
+        payload = sys.stdin.buffer.read()
+
+        # Fast path: with no plan to report on, continue without parsing the
+        # payload (a plain session_id is picked out of the raw bytes)
+        match = SESSION_ID_RE.search(payload)
+        if match and not has_plan_state(match.group(1).decode("utf-8")):
+            output_hook_response(True)
+            sys.exit(0)
+
+        data = json_loads(payload)
 
         session_id = data.get("session_id", "")
         prompt = data.get("prompt", "").strip().lower()
@@ -244,9 +346,17 @@ def main():
         # Check if there were recent blocked stop attempts
         attempts = load_stop_attempts(stop_attempts_file)
 
+        # Import shared helper for cross-session plan tracking; only needed
+        # past the fast path, so it isn't loaded on every prompt
+        try:
+            from plan_session_helper import load_plan_state_with_fallback
+            has_helper = True
+        except ImportError:
+            has_helper = False
+
         # Load plan state with fallback to active plan from other sessions
         is_fallback = False
-        if HAS_HELPER:
+        if has_helper:
             plan_state, plan_state_file, is_fallback = load_plan_state_with_fallback(session_id)
             if is_fallback:
                 log_debug(f"Session {session_id}: Using fallback plan from {plan_state.get('session_id') if plan_state else 'unknown'}")
@@ -269,7 +379,7 @@ def main():
 
         inject_full_context = attempts > 0
 
-        if HAS_HELPER and is_fallback:
+        if has_helper and is_fallback:
             # Session resumed with active plan from another session
             inject_full_context = True
             log_debug(f"Session {session_id}: Session resume detected, injecting full context")
@@ -286,8 +396,7 @@ def main():
         else:
             # Just provide a brief reminder of current task
             next_task = incomplete[0].get("task", "the next task")
-            all_items = plan_state.get("items", [])
-            actionable = [i for i in all_items if i.get("actionable") is not False]
+            actionable = partition_items(plan_state)[0]
             completed = len(actionable) - len(incomplete)
             total = len(actionable)
 
@@ -10,38 +10,45 @@ Environment Variables:
 - CLAUDE_COST_WARNING_THRESHOLD: Percentage to warn at (default: 0.8 = 80%)
 """
 
+import atexit
+import fcntl
 import json
+import mmap
 import sys
 import os
+import time
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuration
 HOOKS_DIR = Path(__file__).parent
 COST_LOG = HOOKS_DIR.parent / "progress/api_costs.json"
+COST_EVENTS = HOOKS_DIR.parent / "progress/api_costs.jsonl"
+COMPACT_RATIO = 10  # fold COST_EVENTS into COST_LOG once it is this many times larger
+COMPACT_MIN_BYTES = 64 * 1024  # ...and at least this large
+COMPACT_LOCK = HOOKS_DIR.parent / "progress/.api_costs.lock"
 DEBUG_LOG = HOOKS_DIR.parent / "progress/.cost_tracker_debug.log"
+DEBUG = os.environ.get("CLAUDE_HOOK_DEBUG") == "1"  # DEBUG_LOG is only written when set
 CONFIG_FILE = HOOKS_DIR / "config.json"
 
-# Import plan session helper for linking costs to plans
-try:
-    from plan_session_helper import (
-        link_cost_session_to_plan,
-        update_plan_accumulated_cost,
-        load_active_plan
-    )
-    PLAN_HELPER_AVAILABLE = True
-except ImportError:
-    PLAN_HELPER_AVAILABLE = False
+
+_CONFIG = None
 
 
 def load_config() -> dict:
-    """Load config from file."""
-    try:
-        if CONFIG_FILE.exists():
-            return json.loads(CONFIG_FILE.read_text())
-    except Exception:
-        pass
-    return {}
+    """Load config from file (read once per process)."""
+    global _CONFIG
+    if _CONFIG is None:
+        try:
+            _CONFIG = json_loads(CONFIG_FILE.read_bytes())
+        except Exception:
+            _CONFIG = {}
+    return _CONFIG
 
 
 def get_cost_limits() -> tuple:
@@ -69,97 +76,357 @@ PRICING = {
     "default": {"input": 15.00, "output": 75.00}
 }
 
+# Per-token (input, output) prices, scaled once at import
+PRICING_SCALED = {
+    model: (p["input"] * 1e-6, p["output"] * 1e-6) for model, p in PRICING.items()
+}
 
-def log_debug(message: str):
-    """Log debug message to file."""
+
+# Hook processes live for milliseconds, so one timestamp serves every
+# cost log field and debug line written during the run.
+NOW_ISO = datetime.now().isoformat()
+
+
+# Debug lines are buffered and appended in one write when the hook exits;
+# these hooks are short-lived and exit through sys.exit or by returning
+_debug_buffer = []
+
+
+def flush_debug_log():
+    """Append all buffered debug lines with a single write."""
+    if not _debug_buffer:
+        return
     try:
         DEBUG_LOG.parent.mkdir(parents=True, exist_ok=True)
-        with open(DEBUG_LOG, "a") as f:
-            f.write(f"[{datetime.now().isoformat()}] {message}\n")
+        fd = os.open(DEBUG_LOG, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, "".join(_debug_buffer).encode("utf-8"))
+        finally:
+            os.close(fd)
     except Exception:
         pass
+    _debug_buffer.clear()
 
 
-def load_cost_log() -> dict:
-    """Load cost log from file."""
-    try:
-        if COST_LOG.exists():
-            return json.loads(COST_LOG.read_text())
-    except Exception as e:
-        log_debug(f"Error loading cost log: {e}")
-    return {"sessions": {}, "total_cost": 0.0}
+if DEBUG:
+    atexit.register(flush_debug_log)
 
 
-def save_cost_log(data: dict):
-    """Save cost log to file."""
-    try:
-        COST_LOG.parent.mkdir(parents=True, exist_ok=True)
-        data["_last_updated"] = datetime.now().isoformat()
-        COST_LOG.write_text(json.dumps(data, indent=2))
-    except Exception as e:
-        log_debug(f"Error saving cost log: {e}")
+def log_debug(message: str):
+    """Log debug message to file (buffered until exit; needs CLAUDE_HOOK_DEBUG=1)."""
+    if DEBUG:
+        _debug_buffer.append(f"[{NOW_ISO}] {message}\n")
 
 
-def calculate_cost(input_tokens: int, output_tokens: int, model: str = "default") -> float:
-    """Calculate cost based on token usage and model."""
-    pricing = PRICING.get(model, PRICING["default"])
+def json_loads(data):
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
-    # Cost per token (pricing is per 1M tokens)
-    input_cost = (input_tokens / 1_000_000) * pricing["input"]
-    output_cost = (output_tokens / 1_000_000) * pricing["output"]
 
-    return input_cost + output_cost
+def json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, optionally 2-space indented."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+        except TypeError:
+            pass  # e.g. non-str keys; stdlib json handles those
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
 
+# Parsed state files, keyed by path: ((st_mtime_ns, st_size), data)
+_CACHE: dict = {}
 
-def get_session_cost(session_id: str) -> dict:
-    """Get cost data for a session."""
-    cost_log = load_cost_log()
-    sessions = cost_log.get("sessions", {})
 
-    if session_id not in sessions:
-        sessions[session_id] = {
-            "total_cost": 0.0,
-            "input_tokens": 0,
-            "output_tokens": 0,
-            "tool_calls": 0,
-            "started_at": datetime.now().isoformat()
-        }
-        cost_log["sessions"] = sessions
-        save_cost_log(cost_log)
+def load_json_cached(path: Path):
+    """Parse a JSON file, reusing the result while its mtime and size are unchanged."""
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    data = json_loads(path.read_bytes())
+    _CACHE[path] = (key, data)
+    return data
 
-    return sessions[session_id]
 
+def load_cost_snapshot() -> dict:
+    """Load the last compacted cost log from file.
 
-def update_session_cost(session_id: str, cost: float, input_tokens: int, output_tokens: int) -> dict:
-    """Update session cost and return new totals."""
-    cost_log = load_cost_log()
+    The parsed log is shared through load_json_cached, so callers that fold
+    events into it work on a copy (see copy_cost_log).
+    """
+    try:
+        return load_json_cached(COST_LOG)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        log_debug(f"Error loading cost log: {e}")
+    return {"sessions": {}, "total_cost": 0.0}
+
+
+def copy_cost_log(cost_log: dict) -> dict:
+    """Copy a cost log deeply enough for events to be applied to the copy."""
     sessions = cost_log.get("sessions", {})
+    return {**cost_log, "sessions": {sid: dict(s) for sid, s in sessions.items()}}
 
-    is_new_session = session_id not in sessions
-    if is_new_session:
-        sessions[session_id] = {
+
+def apply_cost_event(cost_log: dict, event: dict) -> dict:
+    """Add one tool call's usage to its session in cost_log; return the session."""
+    sessions = cost_log.setdefault("sessions", {})
+    session = sessions.get(event["session_id"])
+    if session is None:
+        session = sessions[event["session_id"]] = {
             "total_cost": 0.0,
             "input_tokens": 0,
             "output_tokens": 0,
             "tool_calls": 0,
-            "started_at": datetime.now().isoformat()
+            "started_at": event["ts"]
         }
-
-    session = sessions[session_id]
-    session["total_cost"] += cost
-    session["input_tokens"] += input_tokens
-    session["output_tokens"] += output_tokens
+    session["total_cost"] += event["cost"]
+    session["input_tokens"] += event["input_tokens"]
+    session["output_tokens"] += event["output_tokens"]
     session["tool_calls"] += 1
-    session["last_updated"] = datetime.now().isoformat()
+    session["last_updated"] = event["ts"]
+    cost_log["total_cost"] = cost_log.get("total_cost", 0.0) + event["cost"]
+    return session
 
-    # Update global total
-    cost_log["total_cost"] = sum(s.get("total_cost", 0) for s in sessions.values())
-    cost_log["sessions"] = sessions
 
-    save_cost_log(cost_log)
+def fold_cost_events(cost_log: dict, lines: list, session_id: str = None) -> dict:
+    """Apply JSONL cost event lines to cost_log.
+
+    With session_id, only that session's events are applied, and lines that
+    can't mention it are skipped without being parsed.
+    """
+    needle = json_dumps(session_id) if session_id is not None else b""
+    for line in lines:
+        if needle not in line:
+            continue
+        try:
+            event = json_loads(line)
+            if session_id is None or event["session_id"] == session_id:
+                apply_cost_event(cost_log, event)
+        except (ValueError, KeyError, TypeError):
+            continue  # e.g. a line torn by a killed writer
+    return cost_log
+
+
+def folding_files() -> list:
+    """Event logs renamed aside by compact_cost_log, oldest first."""
+    return sorted(COST_EVENTS.parent.glob(f".{COST_EVENTS.name}.*"))
+
+
+def read_lines(path: Path) -> list:
+    """Lines of a file, or [] if it's gone (e.g. compacted meanwhile)."""
+    try:
+        return path.read_bytes().splitlines()
+    except FileNotFoundError:
+        return []
+
+
+def snapshot_key():
+    """Identity of the current COST_LOG file; changes whenever it's replaced."""
+    try:
+        st = COST_LOG.stat()
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+def load_pending_events() -> tuple:
+    """Load the snapshot and the event lines not yet folded into it.
+
+    Those are COST_EVENTS plus any log a compaction has renamed aside but
+    not yet saved into the snapshot (listed in its "_folded" once it has).
+    A line read twice, from the log and again after it was renamed aside,
+    is kept once. If the snapshot is replaced mid-read, the read is retried.
+    """
+    for _ in range(3):
+        key = snapshot_key()
+        snapshot = load_cost_snapshot()
+        events = read_lines(COST_EVENTS)
+        folded = set(snapshot.get("_folded", ()))
+        lines = []
+        for path in folding_files():
+            if path.name not in folded:
+                lines += read_lines(path)
+        if snapshot_key() == key:
+            break
+    return snapshot, list(dict.fromkeys(lines + events))
+
+
+def load_cost_log() -> dict:
+    """Load the cost log: the compacted file plus the events appended since."""
+    snapshot, lines = load_pending_events()
+    return fold_cost_events(copy_cost_log(snapshot), lines)
+
+
+def load_session_cost(session_id: str) -> dict:
+    """Load one session's totals, or {} if it has none recorded yet.
+
+    Only the session's own pending events are folded in; the grand total
+    and other sessions are left to compact_cost_log.
+    """
+    snapshot, lines = load_pending_events()
+    session = snapshot.get("sessions", {}).get(session_id)
+    cost_log = {"sessions": {session_id: dict(session)} if session else {}}
+    return fold_cost_events(cost_log, lines, session_id)["sessions"].get(session_id, {})
+
+
+def append_cost_event(event: dict):
+    """Append one usage event to the cost event log."""
+    try:
+        COST_EVENTS.parent.mkdir(parents=True, exist_ok=True)
+        # One small O_APPEND write, so concurrent hooks don't interleave
+        fd = os.open(COST_EVENTS, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, json_dumps(event) + b"\n")
+        finally:
+            os.close(fd)
+    except Exception as e:
+        log_debug(f"Error appending cost event: {e}")
+
+
+def compaction_due() -> int:
+    """Size of the event log if it has grown enough to compact, else 0."""
+    try:
+        events_size = COST_EVENTS.stat().st_size
+        snapshot_size = COST_LOG.stat().st_size if COST_LOG.exists() else 0
+    except OSError:
+        return 0  # No log yet
+    return events_size if events_size >= max(COMPACT_MIN_BYTES, COMPACT_RATIO * snapshot_size) else 0
+
+
+def compact_cost_log():
+    """Fold the event log into COST_LOG once it has grown well past it.
+
+    The log is renamed aside before folding, so events other hooks append
+    meanwhile start a fresh log rather than being truncated away; readers
+    count renamed-aside logs until the snapshot lists them as folded (see
+    load_pending_events). Compactions hold COMPACT_LOCK, so they never
+    overwrite each other's snapshot, and a renamed-aside log found unsaved
+    was left by one that died; it is folded in here.
+    """
+    if not compaction_due():
+        return
+    try:
+        lock_fd = os.open(COMPACT_LOCK, os.O_WRONLY | os.O_CREAT, 0o644)
+    except OSError:
+        return
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(lock_fd)
+        return  # Another hook is compacting
+    try:
+        snapshot = load_cost_snapshot()
+        already_folded = set(snapshot.get("_folded", ()))
+        pending = []
+        for path in folding_files():
+            if path.name in already_folded:
+                # Saved into the snapshot, but its compaction died before removing it
+                path.unlink(missing_ok=True)
+            else:
+                pending.append(path)
+
+        # Re-checked under the lock: a compaction may have just finished
+        events_size = compaction_due()
+        if not events_size:
+            return
+        try:
+            folding = COST_EVENTS.with_name(f".{COST_EVENTS.name}.{time.time_ns()}-{os.getpid()}")
+            os.rename(COST_EVENTS, folding)
+        except OSError:
+            return
+        pending.append(folding)  # newest events last
+
+        lines = []
+        for path in pending:
+            lines += read_lines(path)
+        cost_log = fold_cost_events(copy_cost_log(snapshot), list(dict.fromkeys(lines)))
+        cost_log["_folded"] = [path.name for path in pending]
+        if not save_cost_log(cost_log):
+            return  # The logs stay aside, for readers and the next compaction
+        for path in pending:
+            path.unlink(missing_ok=True)
+        log_debug(f"Compacted {events_size} bytes of cost events into {COST_LOG.name}")
+    finally:
+        os.close(lock_fd)  # releases the lock
+
+
+def save_cost_log(data: dict) -> bool:
+    """Save a compacted cost log to file; return whether it was saved.
+
+    Written to a temp file and renamed over COST_LOG, so session_cleanup never
+    reads a half-written log. Not fsynced; cost tracking can tolerate losing
+    the latest update in a crash. Compact unless HOOKS_PRETTY_JSON is set.
+    """
+    tmp_path = COST_LOG.with_name(f".{COST_LOG.name}.{os.getpid()}.tmp")
+    try:
+        COST_LOG.parent.mkdir(parents=True, exist_ok=True)
+        data["_last_updated"] = NOW_ISO
+        tmp_path.write_bytes(json_dumps(data, indent=bool(os.environ.get("HOOKS_PRETTY_JSON"))))
+        os.replace(tmp_path, COST_LOG)
+        # What was just written is the current log; no need to parse it back
+        st = COST_LOG.stat()
+        _CACHE[COST_LOG] = ((st.st_mtime_ns, st.st_size), data)
+        return True
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        log_debug(f"Error saving cost log: {e}")
+        return False
+
+
+def calculate_cost(input_tokens: int, output_tokens: int, model: str = "default") -> float:
+    """Calculate cost based on token usage and model."""
+    input_price, output_price = PRICING_SCALED.get(model) or PRICING_SCALED["default"]
+    return input_tokens * input_price + output_tokens * output_price
+
+
+def get_session_cost(session_id: str) -> dict:
+    """Get cost data for a session."""
+    return load_session_cost(session_id) or {
+        "total_cost": 0.0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "tool_calls": 0,
+        "started_at": NOW_ISO
+    }
+
+
+def update_session_cost(session_id: str, cost: float, input_tokens: int, output_tokens: int) -> dict:
+    """Update session cost and return new totals.
+
+    Only one event line is appended per call; the full cost log is rewritten
+    just when compact_cost_log folds the events in.
+    """
+    session = load_session_cost(session_id)
+    is_new_session = not session
+    event = {
+        "session_id": session_id,
+        "cost": cost,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "ts": NOW_ISO
+    }
+    session = apply_cost_event({"sessions": {session_id: session} if session else {}}, event)
+
+    append_cost_event(event)
+    compact_cost_log()
+
+    # Import plan session helper for linking costs to plans; done here so
+    # tool calls without usage to record never load it
+    try:
+        from plan_session_helper import (
+            link_cost_session_to_plan,
+            update_plan_accumulated_cost
+        )
+        plan_helper_available = True
+    except ImportError:
+        plan_helper_available = False
 
     # Link cost session to active plan and update accumulated cost
-    if PLAN_HELPER_AVAILABLE:
+    if plan_helper_available:
         try:
             # Link this cost session to the active plan (if exists)
             if is_new_session:
@@ -174,44 +441,88 @@ def update_session_cost(session_id: str, cost: float, input_tokens: int, output_
     return session
 
 
+CONTINUE_RESPONSE = b'{"continue":true}\n'  # pre-serialized happy-path response
+
+
 def output_hook_response(continue_execution: bool = True, system_message: str = None):
     """Output JSON response for hook system."""
+    if continue_execution and not system_message:
+        sys.stdout.buffer.write(CONTINUE_RESPONSE)
+        return
     response = {"continue": continue_execution}
     if system_message:
         response["systemMessage"] = system_message
-    print(json.dumps(response))
+    sys.stdout.buffer.write(json_dumps(response) + b"\n")
+
+
+def tail_lines(path: str, n: int = 50):
+    """Yield up to the last n lines of a file, newest first.
+
+    The file is mmapped and scanned backward with rfind, so only the pages
+    holding the tail are read, however long the transcript or its lines.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm)
+            while n > 0 and end > 0:
+                start = mm.rfind(b"\n", 0, end) + 1
+                line = mm[start:end]
+                if line.strip():
+                    yield line
+                    n -= 1
+                end = start - 1
+
+
+def summarize_usage(usage: dict, model: str) -> dict:
+    """Shape an API usage block the way main() consumes it."""
+    return {
+        'usage': usage,
+        'model': model,
+        'input_tokens': usage.get('input_tokens', 0),
+        'output_tokens': usage.get('output_tokens', 0),
+        'cache_read': usage.get('cache_read_input_tokens', 0),
+        'cache_creation': usage.get('cache_creation_input_tokens', 0),
+    }
+
+
+def get_usage_from_payload(data: dict) -> dict:
+    """Read usage data passed inline in the hook payload, if any.
+
+    Only a top-level "usage" block counts: the usage inside a Task tool's
+    response is the subagent's running total, not this model call's.
+    """
+    usage = data.get("usage")
+    if not isinstance(usage, dict):
+        return {}
+    return summarize_usage(usage, data.get("model") or "default")
 
 
 def get_usage_from_transcript(transcript_path: str) -> dict:
     """Read the most recent usage data from the transcript file."""
     try:
-        if not transcript_path or not Path(transcript_path).exists():
+        if not transcript_path:
             return {}
 
-        # Read the last few lines to find the most recent assistant message with usage
-        with open(transcript_path, 'r') as f:
-            lines = f.readlines()
-
-        # Search from the end for an assistant message with usage
-        for line in reversed(lines[-50:]):  # Check last 50 entries
+        # Search from the end for an assistant message with usage, reading
+        # only the tail of the transcript rather than the whole file
+        for line in tail_lines(transcript_path, 50):  # Check last 50 entries
+            # Only assistant entries carry a "usage" key; skip parsing the
+            # (often large) user and tool-result lines around them
+            if b'"usage"' not in line:
+                continue
             try:
-                entry = json.loads(line.strip())
+                entry = json_loads(line)
                 if entry.get('type') == 'assistant':
                     message = entry.get('message', {})
                     if isinstance(message, dict) and 'usage' in message:
-                        usage = message['usage']
-                        model = message.get('model', 'default')
-                        return {
-                            'usage': usage,
-                            'model': model,
-                            'input_tokens': usage.get('input_tokens', 0),
-                            'output_tokens': usage.get('output_tokens', 0),
-                            'cache_read': usage.get('cache_read_input_tokens', 0),
-                            'cache_creation': usage.get('cache_creation_input_tokens', 0),
-                        }
+                        return summarize_usage(message['usage'], message.get('model', 'default'))
             except json.JSONDecodeError:
                 continue
 
+        return {}
+    except FileNotFoundError:
         return {}
     except Exception as e:
         log_debug(f"Error reading transcript: {e}")
@@ -231,13 +542,14 @@ def main():
             sys.exit(0)
 
         # Read JSON input from stdin
-        data = json.load(sys.stdin)
+        data = json_loads(sys.stdin.buffer.read())
 
         session_id = data.get("session_id", "unknown")
         transcript_path = data.get("transcript_path", "")
 
-        # Try to get usage from transcript file (most reliable source)
-        transcript_usage = get_usage_from_transcript(transcript_path)
+        # Use usage passed inline when present; otherwise read it from the
+        # transcript file (the usual, most reliable source)
+        transcript_usage = get_usage_from_payload(data) or get_usage_from_transcript(transcript_path)
 
         if transcript_usage:
             usage = transcript_usage.get('usage', {})
@@ -245,7 +557,7 @@ def main():
             input_tokens = transcript_usage.get('input_tokens', 0)
             output_tokens = transcript_usage.get('output_tokens', 0)
 
-            log_debug(f"Session {session_id}: From transcript - model={model}, in={input_tokens}, out={output_tokens}")
+            log_debug(f"Session {session_id}: Usage - model={model}, in={input_tokens}, out={output_tokens}")
 
             if input_tokens > 0 or output_tokens > 0:
                 # Calculate cost for this call
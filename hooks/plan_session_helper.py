@@ -17,11 +17,23 @@ import json
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 HOOKS_DIR = Path(__file__).parent
 SESSIONS_DIR = HOOKS_DIR / "sessions"
 ACTIVE_PLAN_FILE = SESSIONS_DIR / "active_plan.json"
 
 
+def json_loads(data):
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def get_session_files(session_id: str) -> tuple:
     """Get session-scoped file paths."""
     SESSIONS_DIR.mkdir(parents=True, exist_ok=True)
@@ -34,7 +46,7 @@ def load_active_plan() -> dict:
     """Load the active plan reference."""
     try:
         if ACTIVE_PLAN_FILE.exists():
-            return json.loads(ACTIVE_PLAN_FILE.read_text())
+            return json_loads(ACTIVE_PLAN_FILE.read_bytes())
     except Exception:
         pass
     return None
@@ -81,7 +93,7 @@ def get_plan_state_file(session_id: str) -> Path:
     current_file = SESSIONS_DIR / f"{session_id}_plan_state.json"
     if current_file.exists():
         try:
-            data = json.loads(current_file.read_text())
+            data = json_loads(current_file.read_bytes())
             # Only use if it has a name (indicates it's a real plan)
             if data.get("name") or data.get("items"):
                 return current_file
@@ -111,7 +123,7 @@ def load_plan_state_with_fallback(session_id: str) -> tuple:
     current_file = SESSIONS_DIR / f"{session_id}_plan_state.json"
     if current_file.exists():
         try:
-            data = json.loads(current_file.read_text())
+            data = json_loads(current_file.read_bytes())
             if data.get("name") or data.get("session_id"):
                 return data, current_file, False
         except Exception:
@@ -123,7 +135,7 @@ def load_plan_state_with_fallback(session_id: str) -> tuple:
         active_file = SESSIONS_DIR / f"{active['session_id']}_plan_state.json"
         if active_file.exists():
             try:
-                data = json.loads(active_file.read_text())
+                data = json_loads(active_file.read_bytes())
                 return data, active_file, True
             except Exception:
                 pass
@@ -147,7 +159,7 @@ def find_most_recent_plan() -> tuple:
 
     for f in SESSIONS_DIR.glob("*_plan_state.json"):
         try:
-            data = json.loads(f.read_text())
+            data = json_loads(f.read_bytes())
             # Only consider files with actual plan data
             if not (data.get("name") or data.get("items")):
                 continue
@@ -195,7 +207,7 @@ def link_cost_session_to_plan(cost_session_id: str) -> bool:
         # Also update the plan state file with the cost session ID
         plan_state_file = SESSIONS_DIR / f"{plan_session_id}_plan_state.json"
         if plan_state_file.exists():
-            plan_state = json.loads(plan_state_file.read_text())
+            plan_state = json_loads(plan_state_file.read_bytes())
             plan_state["cost_session_id"] = cost_session_id
             plan_state["updated_at"] = datetime.now().isoformat()
             plan_state_file.write_text(json.dumps(plan_state, indent=2))
@@ -230,7 +242,7 @@ def update_plan_accumulated_cost(cost: float, input_tokens: int, output_tokens:
         if not plan_state_file.exists():
             return False
 
-        plan_state = json.loads(plan_state_file.read_text())
+        plan_state = json_loads(plan_state_file.read_bytes())
 
         # Initialize cost tracking fields if not present
         if "accumulated_cost" not in plan_state:
@@ -24,6 +24,7 @@ DEBUG_LOG = HOOKS_DIR.parent / "progress/.session_cleanup_debug.log"
 SESSION_HISTORY = HOOKS_DIR.parent / "progress/session_history.json"
 DAILY_PROGRESS_DIR = HOOKS_DIR.parent / "progress/daily"
 COST_LOG = HOOKS_DIR.parent / "progress/api_costs.json"
+COST_EVENTS = HOOKS_DIR.parent / "progress/api_costs.jsonl"
 
 
 def get_session_files(session_id: str) -> tuple:
@@ -131,22 +132,81 @@ def update_session_history(session_id: str, plan_state: dict, archive_path: str)
         log_debug(f"Error updating session history: {e}")
 
 
+def read_pending_cost_events() -> tuple:
+    """Read api_costs.json and the event lines not yet folded into it.
+
+    Those are api_costs.jsonl plus any log cost_tracker has renamed aside
+    to compact but not yet saved (listed in "_folded" once it has). Lines
+    seen twice while a log is being renamed count once, and a read that
+    races a compaction replacing api_costs.json is retried.
+    """
+    def log_key():
+        try:
+            st = COST_LOG.stat()
+            return (st.st_ino, st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def read_lines(path):
+        try:
+            return path.read_text().splitlines()
+        except FileNotFoundError:
+            return []
+
+    for _ in range(3):
+        key = log_key()
+        cost_data = {}
+        if key is not None:
+            try:
+                with open(COST_LOG, "r") as f:
+                    cost_data = json.load(f)
+            except FileNotFoundError:
+                pass
+        events = read_lines(COST_EVENTS)
+        folded = set(cost_data.get("_folded", ()))
+        lines = []
+        for path in sorted(COST_EVENTS.parent.glob(f".{COST_EVENTS.name}.*")):
+            if path.name not in folded:
+                lines += read_lines(path)
+        if log_key() == key:
+            break
+    return cost_data, list(dict.fromkeys(lines + events))
+
+
 def get_session_cost_data(session_id: str) -> dict:
-    """Get actual cost data from api_costs.json for a session."""
+    """Get actual cost data for a session from api_costs.json.
+
+    cost_tracker appends per-call events to api_costs.jsonl and only folds
+    them into api_costs.json now and then, so those are added on top.
+    """
     try:
-        if COST_LOG.exists():
-            with open(COST_LOG, "r") as f:
-                cost_data = json.load(f)
-            sessions = cost_data.get("sessions", {})
-            if session_id in sessions:
-                session_cost = sessions[session_id]
-                log_debug(f"Found cost data for session {session_id}: {session_cost}")
-                return {
-                    "cost": session_cost.get("total_cost", 0),
-                    "input_tokens": session_cost.get("input_tokens", 0),
-                    "output_tokens": session_cost.get("output_tokens", 0),
-                    "tool_calls": session_cost.get("tool_calls", 0)
-                }
+        cost_data, lines = read_pending_cost_events()
+        session_cost = cost_data.get("sessions", {}).get(session_id)
+
+        found = session_cost is not None
+        session_cost = session_cost or {}
+        totals = {
+            "cost": session_cost.get("total_cost", 0),
+            "input_tokens": session_cost.get("input_tokens", 0),
+            "output_tokens": session_cost.get("output_tokens", 0),
+            "tool_calls": session_cost.get("tool_calls", 0)
+        }
+
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if event.get("session_id") == session_id:
+                found = True
+                totals["cost"] += event.get("cost", 0)
+                totals["input_tokens"] += event.get("input_tokens", 0)
+                totals["output_tokens"] += event.get("output_tokens", 0)
+                totals["tool_calls"] += 1
+
+        if found:
+            log_debug(f"Found cost data for session {session_id}: {totals}")
+            return totals
     except Exception as e:
         log_debug(f"Error reading cost data: {e}")
     return None